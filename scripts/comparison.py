@@ -1,136 +1,300 @@
 import numpy as np
 import os
-import re
 import time
-from multiprocessing import Pool
-
-
-# Shared Function: Parse ASCII File
-def parse_ascii_file(ascii_file):
-    with open(ascii_file, 'r') as f:
-        lines = f.readlines()
-
-    # Extract parameters
-    start_params = lines.index("START PARAMETERS\n") + 1
-    end_params = lines.index("END PARAMETERS\n")
-    parameter_names = [line.strip() for line in lines[start_params:end_params]]
-
-    # Extract surfaces
-    start_surfaces = lines.index("START SURFACES\n") + 1
-    end_surfaces = lines.index("END SURFACES\n")
-    surfaces = {}
-    for line in lines[start_surfaces:end_surfaces]:
-        parts = line.split("//")
-        surface_id = parts[0].strip()
-        if surface_id == "1 /Sun":
-            surfaces[1] = "Sun (Virtual Surface)"
-        else:
-            try:
-                surface_id = int(surface_id)
-                surface_url = parts[1].strip() if len(parts) > 1 else "Unknown"
-                surfaces[surface_id] = surface_url
-            except (ValueError, IndexError):
-                print(f"Warning: Skipping invalid surface definition: {line.strip()}")
-
-    # Extract power per photon
-    power_per_photon = float(lines[-1].strip())
-
-    return parameter_names, surfaces, power_per_photon
+from concurrent.futures import ThreadPoolExecutor
+from numba import njit
+
+from data_processing import _load_photons, find_binary_files, parse_ascii_file
+
+_FILE_DTYPE = np.dtype(">f8")  # Photon files are written as big-endian doubles
+_READ_GAP = 64 * 1024          # Rows less than this many bytes apart are fetched with one read
+_READ_SPAN = 4 * 1024 * 1024   # Reads never cross a boundary of this many bytes
+
+
+def _read_chunks(file_path, num_parameters, chunk_size):
+    """
+    Streams photon records from a file that cannot be memory-mapped (e.g. a pipe).
+
+    Reads raw bytes into one preallocated native float64 buffer with readinto, byte-swaps them in
+    place and yields views of the complete records it holds; each view is only valid until the
+    next chunk is read.
+    """
+    record_size = num_parameters * 8
+    buffer = np.empty((chunk_size, num_parameters), dtype=np.float64)
+    raw = memoryview(buffer.view(np.uint8).reshape(-1))
+    filled = 0
+
+    with open(file_path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(raw[filled:])
+            if n:
+                filled += n
+                if filled < len(raw):
+                    continue
+            complete = filled // record_size
+            if complete:
+                records = buffer[:complete]
+                if not _FILE_DTYPE.isnative:
+                    records.byteswap(inplace=True)
+                yield records
+            if not n:
+                break
+            filled = 0
+
+
+def _stack_rows(arrays, num_parameters):
+    """Copies row blocks into one preallocated native float64 array, byte-swapping file rows on the way."""
+    total = sum(a.shape[0] for a in arrays)
+    out = np.empty((total, num_parameters), dtype=np.float64)
+    offset = 0
+    for a in arrays:
+        out[offset:offset + a.shape[0]] = a
+        offset += a.shape[0]
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _gather_matching_rows(bits, target):
+    """Copies the rows whose last column has the bit pattern target, in a single pass over the rows."""
+    n, p = bits.shape
+    hits = np.empty(n, dtype=np.int64)
+    count = 0
+    for row in range(n):
+        if bits[row, p - 1] == target:
+            hits[count] = row
+            count += 1
+    out = np.empty((count, p), dtype=np.uint64)
+    for i in range(count):
+        out[i] = bits[hits[i]]
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _append_matching_rows(bits, target, out, cursor):
+    """Copies the rows whose last column has the bit pattern target into out from row cursor on."""
+    n, p = bits.shape
+    for row in range(n):
+        if bits[row, p - 1] == target:
+            out[cursor] = bits[row]
+            cursor += 1
+    return cursor
+
+
+def _select_surface_rows(records, surface_id):
+    """
+    Returns the records that hit surface_id as a native float64 array.
+
+    Rows are compared on the raw bits of the surface column, so big-endian memory maps are filtered
+    without byte-swapping every row; surface IDs are integers, for which equal bits means equal values.
+    """
+    target = np.array(surface_id, dtype=records.dtype).view(np.uint64)
+    rows = _gather_matching_rows(records.view(np.uint64), target)
+    return rows.view(records.dtype).astype(np.float64)
+
+
+def _find_rows(photon_ids, query_ids):
+    """
+    Returns the (sorted) rows of photon_ids whose ID appears in query_ids.
+
+    Photon IDs are normally written in ascending order, so a binary search finds them without
+    sorting; otherwise a single vectorized np.isin membership pass is used.
+    """
+    if len(photon_ids) == 0:
+        return np.empty(0, dtype=np.int64)
+    if not np.all(photon_ids[1:] >= photon_ids[:-1]):
+        return np.flatnonzero(np.isin(photon_ids, query_ids))
+    positions = np.clip(np.searchsorted(photon_ids, query_ids), 0, len(photon_ids) - 1)
+    return np.unique(positions[photon_ids[positions] == query_ids])
+
+
+def _index_photon_ids(photon_ids):
+    """
+    Builds the ID -> row index of a file as (first ID, row count, IDs).
+
+    Files normally hold consecutive IDs, which only need the first ID and the count to resolve a
+    row by offset; otherwise the IDs themselves are kept for searching.
+    """
+    count = len(photon_ids)
+    if count and photon_ids[-1] - photon_ids[0] == count - 1 and np.all(np.diff(photon_ids) == 1):
+        return int(photon_ids[0]), count, None
+    return None, count, photon_ids
+
+
+def _locate_rows(id_index, query_ids):
+    """Returns the sorted rows of an indexed file holding any of the sorted, unique query_ids."""
+    first_id, count, photon_ids = id_index
+    if photon_ids is not None:
+        return _find_rows(photon_ids, query_ids)
+    rows = query_ids - first_id
+    return rows[(rows >= 0) & (rows < count)]
+
+
+def _plan_reads(rows, record_size):
+    """
+    Groups sorted rows into spans that are each fetched with a single read.
+
+    Neighbouring rows are merged while the gap between them stays under _READ_GAP, and spans are
+    split at every _READ_SPAN boundary of the file so each read stays bounded. Returns the span
+    boundaries as indices into rows.
+    """
+    offsets = rows * record_size
+    breaks = np.flatnonzero(
+        (np.diff(offsets) - record_size > _READ_GAP) | (np.diff(offsets // _READ_SPAN) != 0)
+    ) + 1
+    return np.concatenate(([0], breaks, [len(rows)]))
+
+
+def _read_rows(file_path, num_parameters, rows, executor):
+    """
+    Reads the given sorted rows of a file with os.pread, one request per planned span.
+
+    The spans are read concurrently on the executor's threads, which keeps several requests in
+    flight; on platforms without os.pread the rows are gathered from a memory map instead.
+    """
+    if not hasattr(os, "pread"):
+        return np.asarray(_load_photons(file_path, num_parameters)[rows])
+
+    record_size = num_parameters * 8
+    bounds = _plan_reads(rows, record_size)
+    out = np.empty((len(rows), num_parameters), dtype=_FILE_DTYPE)
+
+    def read_span(span):
+        lo, hi = bounds[span], bounds[span + 1]
+        first = rows[lo]
+        size = (rows[hi - 1] - first + 1) * record_size
+        data = os.pread(fd, size, first * record_size)
+        while len(data) < size:
+            more = os.pread(fd, size - len(data), first * record_size + len(data))
+            if not more:
+                raise EOFError(f"Unexpected end of {file_path}")
+            data += more
+        block = np.frombuffer(data, dtype=_FILE_DTYPE).reshape(-1, num_parameters)
+        out[lo:hi] = block[rows[lo:hi] - first]
+
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        list(executor.map(read_span, range(len(bounds) - 1)))
+    finally:
+        os.close(fd)
+    return out
+
+
+def _deduplicate_by_id(photon_records):
+    """
+    Keeps the first record of each photon ID, ordered by ID.
+
+    IDs are compared as int64 rather than float64 keys; records that are already strictly
+    ascending by ID are returned without sorting.
+    """
+    photon_ids = photon_records[:, 0].astype(np.int64)
+    if np.all(photon_ids[1:] > photon_ids[:-1]):
+        return photon_records
+    _, unique_indices = np.unique(photon_ids, return_index=True)
+    return photon_records[unique_indices]
 
 
 # Serial Version
 def filter_photons_serial(binary_files, num_parameters, surface_id):
     photon_records = []
-    previous_ids = set()
+    previous_ids = []
+    file_photons = []  # (ID index, records) per file, so each file is only read once
 
     for binary_file in binary_files:
-        with open(binary_file, "rb") as f:
-            all_data = np.fromfile(f, dtype=">f8")
-            all_photons = all_data.reshape(-1, num_parameters)
+        all_photons = _load_photons(binary_file, num_parameters)
+        file_photons.append((_index_photon_ids(all_photons[:, 0].astype(np.int64)), all_photons))
+
+        # Filter photons hitting the specified surface, gathering full rows only for the hits
+        photons_on_surface = _select_surface_rows(all_photons, surface_id)
+        photon_records.append(photons_on_surface)
 
-            # Filter photons hitting the specified surface
-            photons_on_surface = all_photons[all_photons[:, -1] == surface_id]
-            photon_records.append(photons_on_surface)
+        # Collect previous IDs
+        previous_ids.append(photons_on_surface[:, 5][photons_on_surface[:, 5] != 0])
 
-            # Collect previous IDs
-            previous_ids.update(photons_on_surface[:, 5][photons_on_surface[:, 5] != 0])
+    # Process previous IDs through the index of each cached file
+    previous_ids = np.unique(np.concatenate(previous_ids).astype(np.int64))
+    if previous_ids.size:
+        for id_index, all_photons in file_photons:
+            photon_records.append(all_photons[_locate_rows(id_index, previous_ids)])
 
     # Combine photon records
-    photon_records = np.vstack(photon_records)
-
-    # Process previous IDs
-    if previous_ids:
-        for binary_file in binary_files:
-            with open(binary_file, "rb") as f:
-                all_data = np.fromfile(f, dtype=">f8")
-                all_photons = all_data.reshape(-1, num_parameters)
-                previous_photons = [
-                    all_photons[all_photons[:, 0] == pid][0]
-                    for pid in previous_ids if np.any(all_photons[:, 0] == pid)
-                ]
-                if previous_photons:
-                    photon_records = np.vstack((photon_records, previous_photons))
+    photon_records = _stack_rows(photon_records, num_parameters)
 
     # Deduplicate by photon ID
-    _, unique_indices = np.unique(photon_records[:, 0], return_index=True)
-    return photon_records[unique_indices]
+    return _deduplicate_by_id(photon_records)
 
 
 # Parallel Version
 def process_binary_file(args):
     file_path, num_parameters, surface_id, chunk_size = args
-    relevant_photons = []
-    previous_ids = set()
-
-    with open(file_path, "rb") as f:
-        while True:
-            chunk = np.fromfile(f, dtype=">f8", count=chunk_size * num_parameters)
-            if chunk.size == 0:
-                break
-            chunk = chunk.reshape(-1, num_parameters)
-
-            # Filter photons hitting the specified surface
-            photons_on_surface = chunk[chunk[:, -1] == surface_id]
-            relevant_photons.append(photons_on_surface)
-            previous_ids.update(photons_on_surface[:, 5][photons_on_surface[:, 5] != 0])
 
-    relevant_photons = np.vstack(relevant_photons) if relevant_photons else np.empty((0, num_parameters))
-    return relevant_photons, previous_ids
-
-
-def combine_results(results, binary_files, num_parameters):
+    if os.path.isfile(file_path):
+        # Map the file once and filter it in a single compiled pass, copying only the hits
+        all_photons = _load_photons(file_path, num_parameters)
+        relevant_photons = _select_surface_rows(all_photons, surface_id)
+        photon_ids = all_photons[:, 0].astype(np.int64)
+        del all_photons
+    else:
+        # Sources that cannot be mapped are streamed through a reusable buffer, with the hits
+        # written straight into one output array that doubles whenever a chunk might not fit
+        relevant_photons = np.empty((chunk_size, num_parameters), dtype=np.float64)
+        target = np.array(surface_id, dtype=np.float64).view(np.uint64)
+        cursor = 0
+        id_chunks = []
+        for chunk in _read_chunks(file_path, num_parameters, chunk_size):
+            if cursor + len(chunk) > len(relevant_photons):
+                grown = np.empty((2 * len(relevant_photons), num_parameters), dtype=np.float64)
+                grown[:cursor] = relevant_photons[:cursor]
+                relevant_photons = grown
+            cursor = _append_matching_rows(chunk.view(np.uint64), target, relevant_photons.view(np.uint64), cursor)
+            id_chunks.append(chunk[:, 0].astype(np.int64))
+        relevant_photons = relevant_photons[:cursor]
+        photon_ids = np.concatenate(id_chunks) if id_chunks else np.empty(0, dtype=np.int64)
+
+    # Keep previous IDs as an int64 array rather than boxing each one into a set; combine_results deduplicates them
+    prev = relevant_photons[:, 5]
+    previous_ids = prev[prev != 0].astype(np.int64)
+    return relevant_photons, previous_ids, _index_photon_ids(photon_ids)
+
+
+def find_previous_photons(args):
+    file_path, num_parameters, id_index, previous_ids, executor = args
+    # The index from the first pass gives the rows, so only those records are read back
+    rows = _locate_rows(id_index, previous_ids)
+    if rows.size == 0:
+        return np.empty((0, num_parameters), dtype=_FILE_DTYPE)
+    return _read_rows(file_path, num_parameters, rows, executor)
+
+
+def combine_results(results, binary_files, num_parameters, num_workers=4):
     all_photons = []
-    all_previous_ids = set()
+    all_previous_ids = []
+    id_indexes = []
 
-    for photons, previous_ids in results:
+    for photons, previous_ids, id_index in results:
         all_photons.append(photons)
-        all_previous_ids.update(previous_ids)
-
-    combined_photons = np.vstack(all_photons)
-
-    # Add previous photons
-    if all_previous_ids:
-        for binary_file in binary_files:
-            with open(binary_file, "rb") as f:
-                all_data = np.fromfile(f, dtype=">f8")
-                all_photons = all_data.reshape(-1, num_parameters)
-                previous_photons = [
-                    all_photons[all_photons[:, 0] == pid][0]
-                    for pid in all_previous_ids if np.any(all_photons[:, 0] == pid)
-                ]
-                if previous_photons:
-                    combined_photons = np.vstack((combined_photons, previous_photons))
+        all_previous_ids.append(previous_ids)
+        id_indexes.append(id_index)
+
+    # Add previous photons by reading back only their indexed rows, with the reads of each file spread over the threads
+    all_previous_ids = np.unique(np.concatenate(all_previous_ids)) if all_previous_ids else np.empty(0, dtype=np.int64)
+    if all_previous_ids.size:
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            for file, id_index in zip(binary_files, id_indexes):
+                all_photons.append(find_previous_photons((file, num_parameters, id_index, all_previous_ids, executor)))
+
+    combined_photons = _stack_rows(all_photons, num_parameters)
 
     # Deduplicate
-    _, unique_indices = np.unique(combined_photons[:, 0], return_index=True)
-    return combined_photons[unique_indices]
+    return _deduplicate_by_id(combined_photons)
 
 
 def filter_photons_parallel(binary_files, num_parameters, surface_id, chunk_size=10_000, num_workers=4):
+    # The numba row filters run without the GIL while scanning the mapped files, so the files are scanned
+    # concurrently and the threads share the results without pickling
     args = [(file, num_parameters, surface_id, chunk_size) for file in binary_files]
-    with Pool(processes=num_workers) as pool:
-        results = pool.map(process_binary_file, args)
-    return combine_results(results, binary_files, num_parameters)
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        results = list(executor.map(process_binary_file, args))
+    return combine_results(results, binary_files, num_parameters, num_workers)
 
 
 # Comparison Script
@@ -155,7 +319,7 @@ if __name__ == "__main__":
     surface_id = 3
     parameter_names, surfaces, power_per_photon = parse_ascii_file(ascii_file)
     num_parameters = len(parameter_names)
-    binary_files = sorted([os.path.join(binary_dir, f) for f in os.listdir(binary_dir) if re.match(r"photons.*\.dat", f)])
+    binary_files = find_binary_files(binary_dir)
 
     # Run Serial Version
     print("Running Serial Version...")
@@ -1,9 +1,37 @@
+import hashlib
+import itertools
+import json
 import numpy as np
 import os
+import re
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from numba import njit, types
+from numba.typed import Dict
+
+_PHOTON_RE = re.compile(r"photons.*\.dat\Z")
+
+
+def find_binary_files(binary_dir):
+    """
+    Lists the Tonatiuh++ binary photon files (photons*.dat) in a directory.
+
+    Args:
+        binary_dir (str): Directory containing the binary files.
+
+    Returns:
+        list: Sorted list of binary file paths.
+    """
+    return sorted(entry.path for entry in os.scandir(binary_dir) if _PHOTON_RE.match(entry.name))
+
 
 def parse_ascii_file(ascii_file):
     """
     Parses the ASCII file to extract parameter names, surface definitions, and power per photon.
+
+    The result is cached in a JSON sidecar next to the ASCII file, keyed by its modification time
+    and size, so repeated runs on unchanged data skip the parse.
+
     Args:
         ascii_file (str): Path to the ASCII file.
 
@@ -13,36 +41,248 @@ def parse_ascii_file(ascii_file):
             - surfaces: Dictionary mapping surface IDs to URLs or special definitions.
             - power_per_photon: Power per photon (float).
     """
-    with open(ascii_file, 'r') as f:
-        lines = f.readlines()
+    stat = os.stat(ascii_file)
+    key = hashlib.sha1(f"{stat.st_mtime_ns}:{stat.st_size}".encode()).hexdigest()
+    cache_file = ascii_file + ".cache.json"
+
+    try:
+        with open(cache_file, "r") as f:
+            cached = json.load(f)
+        if cached["key"] == key:
+            # JSON object keys are strings, so the surface IDs are converted back to integers
+            surfaces = {int(surface_id): url for surface_id, url in cached["surfaces"].items()}
+            return list(cached["parameter_names"]), surfaces, float(cached["power_per_photon"])
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        pass  # Missing, unreadable or malformed cache: parse the file
+
+    parameter_names, surfaces, power_per_photon = _parse_ascii_file(ascii_file)
+    try:
+        with open(cache_file, "w") as f:
+            json.dump(
+                {"key": key, "parameter_names": parameter_names, "surfaces": surfaces, "power_per_photon": power_per_photon},
+                f,
+            )
+    except OSError:
+        pass  # Read-only data directory: run without the cache
+    return parameter_names, surfaces, power_per_photon
 
-    # Extract parameters
-    start_params = lines.index("START PARAMETERS\n") + 1
-    end_params = lines.index("END PARAMETERS\n")
-    parameter_names = [line.strip() for line in lines[start_params:end_params]]
 
-    # Extract surfaces
-    start_surfaces = lines.index("START SURFACES\n") + 1
-    end_surfaces = lines.index("END SURFACES\n")
+def _parse_ascii_file(ascii_file):
+    """Parses the ASCII file in a single pass; see parse_ascii_file."""
+    parameter_names = []
     surfaces = {}
-    for line in lines[start_surfaces:end_surfaces]:
-        parts = line.split("//")
-        surface_id = parts[0].strip()
-        if surface_id == "1 /Sun":
-            surfaces[1] = "Sun (Virtual Surface)"  # Special mapping for the Sun
-        else:
-            try:
-                surface_id = int(surface_id)  # Convert to integer for physical surfaces
-                surface_url = parts[1].strip() if len(parts) > 1 else "Unknown"
-                surfaces[surface_id] = surface_url
-            except (ValueError, IndexError):
-                print(f"Warning: Skipping invalid surface definition: {line.strip()}")
+    section = None
+    sections_done = set()
+    last_line = ""
+
+    # Single pass over the file, tracking the current section
+    with open(ascii_file, 'r') as f:
+        for line in f:
+            if line.strip():
+                last_line = line
+            marker = line.rstrip("\n")
+            if marker in ("START PARAMETERS", "START SURFACES"):
+                section = marker.split()[1]
+                continue
+            if marker in ("END PARAMETERS", "END SURFACES"):
+                sections_done.add(section)
+                section = None
+                continue
+
+            # Extract parameters
+            if section == "PARAMETERS":
+                parameter_names.append(line.strip())
+
+            # Extract surfaces
+            elif section == "SURFACES":
+                parts = line.split("//")
+                surface_id = parts[0].strip()
+                if surface_id == "1 /Sun":
+                    surfaces[1] = "Sun (Virtual Surface)"  # Special mapping for the Sun
+                else:
+                    try:
+                        surface_id = int(surface_id)  # Convert to integer for physical surfaces
+                        surface_url = parts[1].strip() if len(parts) > 1 else "Unknown"
+                        surfaces[surface_id] = surface_url
+                    except (ValueError, IndexError):
+                        print(f"Warning: Skipping invalid surface definition: {line.strip()}")
+
+    missing = {"PARAMETERS", "SURFACES"} - sections_done
+    if missing:
+        raise ValueError(f"Missing {', '.join(sorted(missing))} section in {ascii_file}")
 
     # Extract power per photon
-    power_per_photon = float(lines[-1].strip())
+    power_per_photon = float(last_line.strip())
 
     return parameter_names, surfaces, power_per_photon
 
+
+@dataclass
+class PhotonColumns:
+    """
+    Photon records of one binary file split into native-endian columns.
+
+    Attributes:
+        id (np.ndarray): Photon IDs (int64).
+        prev (np.ndarray): Previous photon IDs (int64), 0 at trajectory starts.
+        next (np.ndarray): Next photon IDs (int64), 0 at trajectory ends.
+        surface (np.ndarray): Surface IDs (int64).
+        data (np.ndarray): Full photon records as native float64, shape (N, num_parameters).
+    """
+    id: np.ndarray
+    prev: np.ndarray
+    next: np.ndarray
+    surface: np.ndarray
+    data: np.ndarray
+
+    @classmethod
+    def from_records(cls, photons):
+        """
+        Converts big-endian photon records to native columns in a single pass.
+
+        Args:
+            photons (np.ndarray): Photon records of shape (N, num_parameters).
+
+        Returns:
+            PhotonColumns: Column view of the records.
+        """
+        data = photons.astype(np.float64)
+        photon_ids, previous_ids, next_ids, surface_ids = data[:, [0, 5, 6, -1]].astype(np.int64).T
+        return cls(photon_ids, previous_ids, next_ids, surface_ids, data)
+
+
+def _load_photons(file_path, num_parameters):
+    """
+    Memory-maps a binary photon file without copying it into memory.
+
+    Args:
+        file_path (str): Path to the binary file.
+        num_parameters (int): Number of parameters per photon.
+
+    Returns:
+        np.ndarray: Read-only big-endian array of shape (N, num_parameters).
+    """
+    if os.path.getsize(file_path) == 0:
+        return np.empty((0, num_parameters), dtype=">f8")
+    return np.memmap(file_path, dtype=">f8", mode="r").reshape(-1, num_parameters)
+
+
+@njit(cache=True, nogil=True)
+def _lookup_rows_sparse(photon_ids, query_ids):
+    """Resolves photon IDs to their rows through a typed dict, -1 if absent."""
+    id_to_row = Dict.empty(key_type=types.int64, value_type=types.int64)
+    for row in range(len(photon_ids)):
+        id_to_row[photon_ids[row]] = row
+
+    rows = np.full(len(query_ids), -1, dtype=np.int64)
+    for i in range(len(query_ids)):
+        if query_ids[i] in id_to_row:
+            rows[i] = id_to_row[query_ids[i]]
+    return rows
+
+
+def _lookup_rows(photon_ids, query_ids):
+    """
+    Resolves photon IDs to their rows.
+
+    Photon files usually hold consecutive IDs, in which case the row is just an offset and no
+    map is built at all. Otherwise dense IDs index an ID-to-row array, and a typed dict is used
+    when the IDs are too sparse for that array to stay small.
+
+    Args:
+        photon_ids (np.ndarray): Photon IDs (int64), one per row.
+        query_ids (np.ndarray): Photon IDs (int64) to look up. ID 0 means "no photon".
+
+    Returns:
+        np.ndarray: Row of each queried photon, -1 if absent.
+    """
+    if len(photon_ids) == 0:
+        return np.full(len(query_ids), -1, dtype=np.int64)
+
+    first_id = int(photon_ids[0])
+    if int(photon_ids[-1]) - first_id == len(photon_ids) - 1 and np.all(np.diff(photon_ids) == 1):
+        rows = query_ids - first_id
+        rows[(rows < 0) | (rows >= len(photon_ids))] = -1
+        rows[query_ids == 0] = -1
+        return rows
+
+    max_id = int(photon_ids.max())
+    if photon_ids.min() < 0 or max_id > 4 * len(photon_ids) + 1024:
+        rows = _lookup_rows_sparse(photon_ids, query_ids)
+    else:
+        row_of = np.full(max_id + 1, -1, dtype=np.int64)
+        row_of[photon_ids] = np.arange(len(photon_ids))
+        in_range = (query_ids >= 0) & (query_ids <= max_id)
+        rows = np.full(len(query_ids), -1, dtype=np.int64)
+        rows[in_range] = row_of[query_ids[in_range]]
+
+    rows[query_ids == 0] = -1
+    return rows
+
+
+@njit(cache=True, nogil=True)
+def _build_trajectories(next_rows, starts):
+    """
+    Follows the next-photon links from each trajectory start.
+
+    Args:
+        next_rows (np.ndarray): Row of the next photon for each photon, -1 if absent.
+        starts (np.ndarray): Rows where trajectories begin.
+
+    Returns:
+        tuple: (order, offsets)
+            - order: Photon rows of all trajectories, concatenated.
+            - offsets: Start of each trajectory in `order`, plus the total length.
+    """
+    lengths = np.zeros(len(starts), dtype=np.int64)
+    for t in range(len(starts)):
+        row = starts[t]
+        while row != -1:
+            lengths[t] += 1
+            row = next_rows[row]
+
+    offsets = np.zeros(len(starts) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(lengths)
+
+    order = np.empty(offsets[-1], dtype=np.int64)
+    for t in range(len(starts)):
+        row = starts[t]
+        position = offsets[t]
+        while row != -1:
+            order[position] = row
+            position += 1
+            row = next_rows[row]
+    return order, offsets
+
+
+def _assemble_file_trajectories(file_path, num_parameters):
+    """
+    Builds the ray trajectories of a single binary file as one flat array.
+
+    Args:
+        file_path (str): Path to the binary file.
+        num_parameters (int): Number of parameters per photon.
+
+    Returns:
+        tuple: (records, offsets)
+            - records: Photon records of all trajectories, concatenated in trajectory order.
+            - offsets: Start of each trajectory in `records`, plus the total length.
+    """
+    photons = PhotonColumns.from_records(_load_photons(file_path, num_parameters))
+
+    # Walk every trajectory from its start (previous ID = 0) in compiled code
+    starts = np.flatnonzero(photons.prev == 0)
+    next_rows = _lookup_rows(photons.id, photons.next)
+    order, offsets = _build_trajectories(next_rows, starts)
+
+    return photons.data[order], offsets
+
+
+def _split_trajectories(records, offsets):
+    """Splits flat trajectory records at their offsets into a list of trajectories."""
+    return np.split(records, offsets[1:-1]) if len(records) else []
+
+
 def process_binary_file_sequential(file_path, num_parameters):
     """
     Processes a single binary file to build ray trajectories sequentially.
@@ -52,23 +292,9 @@ def process_binary_file_sequential(file_path, num_parameters):
         num_parameters (int): Number of parameters per photon.
 
     Returns:
-        list: List of ray trajectories. Each trajectory is a list of photon records.
+        list: List of ray trajectories. Each trajectory is an array of photon records.
     """
-    photons = np.fromfile(file_path, dtype=">f8").reshape(-1, num_parameters)
-    photon_dict = {int(photon[0]): photon for photon in photons}  # Map photon IDs to photon records
-
-    # Build ray trajectories
-    trajectories = []
-    for photon in photons:
-        if int(photon[5]) == 0:  # Start of a trajectory (previous ID = 0)
-            trajectory = []
-            current_id = int(photon[0])
-            while current_id != 0:
-                trajectory.append(photon_dict[current_id])
-                current_id = int(photon_dict[current_id][6]) if current_id in photon_dict else 0
-            trajectories.append(trajectory)
-    
-    return trajectories
+    return _split_trajectories(*_assemble_file_trajectories(file_path, num_parameters))
 
 
 def consolidate_trajectories(all_trajectories):
@@ -81,34 +307,36 @@ def consolidate_trajectories(all_trajectories):
     Returns:
         list: Consolidated ray trajectories.
     """
-    trajectory_map = {}  # Map of trajectory start ID to trajectory
+    if not all_trajectories:
+        return []
 
-    for trajectory in all_trajectories:
-        start_id = int(trajectory[0][0])  # Use the ID of the first photon in the trajectory
-        if start_id in trajectory_map:
-            raise ValueError(f"Duplicate trajectory start ID found: {start_id}")
-        trajectory_map[start_id] = trajectory
+    # Hoist the ID conversions out of the chaining loop
+    start_ids = np.array([trajectory[0, 0] for trajectory in all_trajectories]).astype(np.int64)
+    next_ids = np.array([trajectory[-1, 6] for trajectory in all_trajectories]).astype(np.int64).tolist()
+
+    unique_ids, counts = np.unique(start_ids, return_counts=True)
+    if np.any(counts > 1):
+        raise ValueError(f"Duplicate trajectory start ID found: {unique_ids[counts > 1][0]}")
+    start_to_idx = dict(zip(start_ids.tolist(), range(len(start_ids))))  # Map of trajectory start ID to index
 
     # Consolidate overlapping trajectories
     consolidated = []
-    visited = set()
+    visited = np.zeros(len(all_trajectories), dtype=bool)
 
-    for trajectory in trajectory_map.values():
-        if int(trajectory[0][0]) in visited:  # Skip already consolidated trajectories
+    for idx, trajectory in enumerate(all_trajectories):
+        if visited[idx]:  # Skip already consolidated trajectories
             continue
+        visited[idx] = True
 
-        consolidated_trajectory = trajectory
-        visited.add(int(trajectory[0][0]))
-
-        # Check for continuation of the trajectory
-        while True:
-            next_id = int(consolidated_trajectory[-1][6])  # Next ID of the last photon
-            if next_id == 0 or next_id not in trajectory_map:
-                break
-            consolidated_trajectory += trajectory_map[next_id]
-            visited.add(next_id)
+        # Check for continuation of the trajectory through the next ID of its last photon
+        pieces = [trajectory]
+        current = start_to_idx.get(next_ids[idx]) if next_ids[idx] != 0 else None
+        while current is not None:
+            pieces.append(all_trajectories[current])
+            visited[current] = True
+            current = start_to_idx.get(next_ids[current]) if next_ids[current] != 0 else None
 
-        consolidated.append(consolidated_trajectory)
+        consolidated.append(pieces[0] if len(pieces) == 1 else np.concatenate(pieces))
 
     return consolidated
 
@@ -124,48 +352,50 @@ def filter_relevant_trajectories(trajectories, surface_id):
     Returns:
         np.ndarray: Array of filtered photon records.
     """
-    relevant_photons = []
+    # Skip trajectories with no length
+    trajectories = [trajectory for trajectory in trajectories if len(trajectory) >= 2]
+    if not trajectories:
+        return np.array([])
 
-    for trajectory in trajectories:
-        # Skip trajectories with no length
-        if len(trajectory) < 2:
-            continue
-
-        # Check if any photon in the trajectory is on the surface of interest
-        surface_photons = [p for p in trajectory if int(p[-1]) == surface_id]
-        if not surface_photons:
-            continue
+    # Stack all trajectories, tagging every photon with its trajectory index
+    all_records = np.concatenate(trajectories)
+    lengths = np.fromiter((len(trajectory) for trajectory in trajectories), dtype=np.int64, count=len(trajectories))
+    trajectory_index = np.repeat(np.arange(len(trajectories)), lengths)
 
-        # Extract the surface photon and its previous photon
-        surface_photon = surface_photons[0]
-        previous_id = int(surface_photon[5])
-        previous_photon = next((p for p in trajectory if int(p[0]) == previous_id), None)
+    # First photon on the surface of interest in each trajectory
+    hits = np.flatnonzero(all_records[:, -1] == surface_id)
+    _, first_hits = np.unique(trajectory_index[hits], return_index=True)
+    surface_rows = hits[first_hits]
 
-        if previous_photon is not None:
-            relevant_photons.append(previous_photon)
-        relevant_photons.append(surface_photon)
+    # Gather the previous photon of each surface photon within the same trajectory
+    photon_ids = all_records[:, 0].astype(np.int64)
+    previous_ids = all_records[surface_rows, 5].astype(np.int64)
+    previous_rows = _lookup_rows(photon_ids, previous_ids)
+    found = (previous_rows >= 0) & (trajectory_index[previous_rows] == trajectory_index[surface_rows])
 
-    return np.array(relevant_photons)
+    # Interleave (previous photon, surface photon) pairs, dropping missing previous photons
+    pairs = np.column_stack((np.where(found, previous_rows, -1), surface_rows)).ravel()
+    return all_records[pairs[pairs >= 0]]
 
 
-def process_binary_files_sequential(binary_files, num_parameters, surface_id):
+def process_binary_files_sequential(binary_files, num_parameters, surface_id, num_workers=None):
     """
-    Processes all binary files sequentially and consolidates trajectories.
+    Builds trajectories for each binary file in parallel, then consolidates them in order.
 
     Args:
         binary_files (list): List of binary file paths.
         num_parameters (int): Number of parameters per photon.
         surface_id (int): Surface ID of interest.
+        num_workers (int): Number of worker threads, or None for the executor's default.
 
     Returns:
         np.ndarray: Array of relevant photon records.
     """
-    all_trajectories = []
-
-    # Process each binary file
-    for file_path in binary_files:
-        file_trajectories = process_binary_file_sequential(file_path, num_parameters)
-        all_trajectories.extend(file_trajectories)
+    # Process each binary file independently; the trajectory kernels run without the GIL, so the files
+    # are assembled concurrently in threads, which is safe after numba's parallel kernels have run
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        per_file = list(executor.map(lambda file_path: _assemble_file_trajectories(file_path, num_parameters), binary_files))
+    all_trajectories = list(itertools.chain.from_iterable(_split_trajectories(*result) for result in per_file))
 
     # Consolidate trajectories across files
     consolidated_trajectories = consolidate_trajectories(all_trajectories)
@@ -1,5 +1,4 @@
 import os
-import re
 import sys
 import numpy as np
 import matplotlib.pyplot as plt
@@ -10,15 +9,15 @@ from scipy.spatial import ConvexHull
 # Add the modules folder to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../modules")))
 
-from data_processing import parse_ascii_file, process_binary_files_sequential
-from compute_directions import compute_directions
+from data_processing import find_binary_files, parse_ascii_file, process_binary_files_sequential
 from transformation import (
-    transform_to_local,
-    compute_angular_deviation,
+    compute_directions,
+    transform_and_compute_deviation,
     compute_local_coordinate_system,
 )
 
 from visualization import (
+    PolarProjection,
     plot_angular_distribution,
     plot_power_azimuth,
     plot_power_zenith,
@@ -58,9 +57,7 @@ if __name__ == "__main__":
     print(f"Time to parse ASCII file: {ascii_end - ascii_start:.2f} seconds")
 
     # Detect binary files
-    binary_files = sorted(
-        [os.path.join(binary_dir, f) for f in os.listdir(binary_dir) if re.match(r"photons.*\.dat", f)]
-    )
+    binary_files = find_binary_files(binary_dir)
     total_binary_size = sum(os.path.getsize(f) for f in binary_files)
     print(f"Total binary file size: {total_binary_size / (1024**2):.2f} MB")
 
@@ -77,17 +74,13 @@ if __name__ == "__main__":
     directions_end = time.time()
     print(f"Time to compute directions: {directions_end - directions_start:.2f} seconds")
 
-    # Transform directions to the local coordinate system
+    # Transform directions to the local coordinate system and compute angular deviations in one pass
     local_directions_start = time.time()
-    local_directions = transform_to_local(directions, local_x, local_y, local_z)
+    local_directions, angular_deviations = transform_and_compute_deviation(
+        directions, local_x, local_y, local_z, local_reference_vector
+    )
     local_directions_end = time.time()
-    print(f"Time to transform directions to local coordinates: {local_directions_end - local_directions_start:.2f} seconds")
-
-    # Compute angular deviations in the local coordinate system
-    angular_start = time.time()
-    angular_deviations = compute_angular_deviation(local_directions, local_reference_vector)
-    angular_end = time.time()
-    print(f"Time to compute angular deviations: {angular_end - angular_start:.2f} seconds")
+    print(f"Time to transform directions and compute angular deviations: {local_directions_end - local_directions_start:.2f} seconds")
 
     # Report statistics
     total_photons = total_binary_size // (num_parameters * 8)
@@ -99,18 +92,19 @@ if __name__ == "__main__":
     print(f"2. Total binary data size processed: {total_binary_size / (1024**2):.2f} MB")
     print(f"3. Total number of photons on the selected surface: {total_surface_photons}")
     print(f"4. Total number of direction vectors: {total_directions}")
-    print(f"\nAverage Angular Deviation: {np.mean(angular_deviations):.2f} degrees")
+    print(f"\nAverage Angular Deviation: {np.mean(angular_deviations, dtype=np.float64):.2f} degrees")
 
     # Visualization
     bins = 50
     visualization_start = time.time()
-    plot_polar_distribution_of_rays_with_hull(local_directions)
-    plot_polar_power_distribution_with_hull(local_directions, power_per_photon, bins)
-    plot_polar_normalized_power_distribution(local_directions, power_per_photon, bins)
-    plot_angular_distribution(angular_deviations, power_per_photon, bins)  # Angular deviation histogram
-    plot_power_azimuth(local_directions, power_per_photon, bins)
-    plot_power_zenith(local_directions, power_per_photon, bins)
-    plot_power_zenith_asymmetric(local_directions, power_per_photon, bins)
+    polar_projection = PolarProjection.from_directions(local_directions)  # Shared by the polar, azimuth and zenith plots
+    plot_polar_distribution_of_rays_with_hull(polar_projection, show=True)
+    plot_polar_power_distribution_with_hull(polar_projection, power_per_photon, bins, show=True)
+    plot_polar_normalized_power_distribution(polar_projection, power_per_photon, bins, show=True)
+    plot_angular_distribution(angular_deviations, power_per_photon, bins, show=True)  # Angular deviation histogram
+    plot_power_azimuth(polar_projection, power_per_photon, bins, show=True)
+    plot_power_zenith(polar_projection, power_per_photon, bins, show=True)
+    plot_power_zenith_asymmetric(polar_projection, power_per_photon, bins, show=True)
     visualization_end = time.time()
     print(f"Time for visualization: {visualization_end - visualization_start:.2f} seconds")
 
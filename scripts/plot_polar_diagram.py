@@ -1,38 +1,51 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.spatial import ConvexHull
+
+from visualization import _akl_toussaint_filter, _convex_hull
 
 # Function to plot azimuth and zenith angle with convex hull
-def plot_polar_azimuth_zenith_with_hull(csv_file, output_hull_file, point_size=1):
+def plot_polar_azimuth_zenith_with_hull(csv_file, output_hull_file, bins=(180, 90)):
 
     # Read the CSV file
     data = pd.read_csv(csv_file)
 
     # Extract the data
-    azimuth = np.deg2rad(data['Azimuth'])  # Convert azimuth to radians
-    zenith = data['Elevation']            # Treat elevation as zenith angle
-    lengths = data['Length']              # Length of the direction vector
+    azimuth = np.deg2rad(data['Azimuth'].to_numpy())  # Convert azimuth to radians
+    zenith = data['Elevation'].to_numpy()              # Treat elevation as zenith angle
+    lengths = data['Length'].to_numpy()                # Length of the direction vector
 
     # Convert polar coordinates to Cartesian for Convex Hull calculation
     x = zenith * np.cos(azimuth)
     y = zenith * np.sin(azimuth)
-    points = np.vstack((x, y)).T
 
-    # Calculate the convex hull
-    hull = ConvexHull(points)
+    # Calculate the convex hull, discarding the points that cannot be vertices before the exact hull
+    hull_points = _convex_hull(_akl_toussaint_filter(x, y))
+    hull_x, hull_y = hull_points[:, 0], hull_points[:, 1]
+
+    # Aggregate the rays into a fixed (azimuth, zenith) grid holding the mean ray path length per bin;
+    # each ray is assigned to its bin once and both reductions share that index
+    azimuth_edges = np.linspace(0, 2 * np.pi, bins[0] + 1)
+    zenith_edges = np.linspace(0, 90, bins[1] + 1)
+    in_range = (zenith >= 0) & (zenith <= 90)
+    azimuth_bin = np.minimum((np.mod(azimuth[in_range], 2 * np.pi) * (bins[0] / (2 * np.pi))).astype(np.int64), bins[0] - 1)
+    zenith_bin = np.minimum((zenith[in_range] * (bins[1] / 90)).astype(np.int64), bins[1] - 1)
+    flat_bin = azimuth_bin * bins[1] + zenith_bin
+    counts = np.bincount(flat_bin, minlength=bins[0] * bins[1]).reshape(bins)
+    length_sum = np.bincount(flat_bin, weights=lengths[in_range], minlength=bins[0] * bins[1]).reshape(bins)
+    mean_length = np.ma.masked_where(counts == 0, length_sum / np.maximum(counts, 1))
 
     # Create the polar plot
     fig, ax = plt.subplots(subplot_kw={'projection': 'polar'}, figsize=(8, 8))
-    sc = ax.scatter(azimuth, zenith, c=lengths, cmap='plasma', s=point_size, edgecolor='none')
+    mesh = ax.pcolormesh(azimuth_edges, zenith_edges, mean_length.T, cmap='plasma', shading='flat')
 
     # Plot the convex hull
-    hull_vertices = np.append(hull.vertices, hull.vertices[0])  # Close the hull
-    ax.plot(azimuth[hull_vertices], zenith[hull_vertices], color='red', linewidth=1.5, label='Convex Hull')
+    hull_x, hull_y = np.append(hull_x, hull_x[0]), np.append(hull_y, hull_y[0])  # Close the hull
+    ax.plot(np.arctan2(hull_y, hull_x), np.hypot(hull_x, hull_y), color='red', linewidth=1.5, label='Convex Hull')
 
     # Add a colorbar for the length
-    cbar = plt.colorbar(sc, ax=ax, orientation='vertical')
-    cbar.set_label('Ray Path Length')
+    cbar = plt.colorbar(mesh, ax=ax, orientation='vertical')
+    cbar.set_label('Mean Ray Path Length')
 
     # Add grid and labels
     ax.set_theta_zero_location("N")  # Set 0° at the top
@@ -48,12 +61,8 @@ def plot_polar_azimuth_zenith_with_hull(csv_file, output_hull_file, point_size=1
     plt.show()
 
     # Extract hull coordinates in terms of azimuth and zenith
-    hull_azimuth = np.rad2deg(np.arctan2(y[hull.vertices], x[hull.vertices])) % 360  # Convert back to degrees
-    hull_zenith = zenith[hull.vertices]
-
-    # Append the first element to close the hull
-    hull_azimuth = np.append(hull_azimuth, hull_azimuth[:1])
-    hull_zenith = np.append(hull_zenith, hull_zenith[:1])
+    hull_azimuth = np.rad2deg(np.arctan2(hull_y[:-1], hull_x[:-1])) % 360  # Convert back to degrees
+    hull_zenith = np.hypot(hull_x[:-1], hull_y[:-1])
 
     # Save the hull coordinates to a CSV file after plotting
     hull_data = pd.DataFrame({'Azimuth': hull_azimuth, 'Zenith': hull_zenith})
@@ -62,4 +71,4 @@ def plot_polar_azimuth_zenith_with_hull(csv_file, output_hull_file, point_size=1
 # Usage example
 csv_file_path = "C:/Users/manue_6t240gh/Dropbox/OpenSource/angular_distribution/data/results.csv"
 hull_file_path = "C:/Users/manue_6t240gh/Dropbox/OpenSource/angular_distribution/data/convex_hull_coordinates.csv"
-plot_polar_azimuth_zenith_with_hull(csv_file_path, hull_file_path, point_size=0.5)
+plot_polar_azimuth_zenith_with_hull(csv_file_path, hull_file_path)
@@ -1,11 +1,64 @@
+import functools
+import math
 import numpy as np
 import os
 import sys
+from numba import njit, prange
 
 # Ensure the modules folder is in the Python path to import the .pyd module
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../modules")))
 
-from compute_directions import compute_directions  # Import from the .pyd module
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _compute_directions_kernel(positions, sorted_ids, sorted_rows, previous_ids, direction_vectors, valid):
+    for i in prange(len(previous_ids)):
+        valid[i] = False
+        k = np.searchsorted(sorted_ids, previous_ids[i])
+        if k < len(sorted_ids) and sorted_ids[k] == previous_ids[i]:
+            j = sorted_rows[k]
+            dx = positions[j, 0] - positions[i, 0]
+            dy = positions[j, 1] - positions[i, 1]
+            dz = positions[j, 2] - positions[i, 2]
+            norm = math.sqrt(dx * dx + dy * dy + dz * dz)
+            if norm != 0.0:
+                direction_vectors[i, 0] = dx / norm
+                direction_vectors[i, 1] = dy / norm
+                direction_vectors[i, 2] = dz / norm
+                valid[i] = True
+
+
+def compute_directions_fallback(photon_records):
+    """
+    Computes normalized direction vectors from each photon towards its previous photon.
+
+    Compiled (Numba) counterpart of the prebuilt `compute_directions` module, used when that
+    module is not available.
+
+    Args:
+        photon_records (np.ndarray): Photon records containing both the previous and the surface photons.
+
+    Returns:
+        np.ndarray: Array of normalized float32 direction vectors (shape: [M, 3]) for every photon
+            whose previous photon is in the records. Positions are subtracted in float64 first.
+    """
+    photon_ids = photon_records[:, 0].astype(np.int64)
+    previous_ids = photon_records[:, 5].astype(np.int64)
+    positions = np.ascontiguousarray(photon_records[:, 1:4], dtype=np.float64)
+
+    # Sorted IDs let the kernel join each photon to its previous photon with a binary search
+    sorted_rows = np.argsort(photon_ids)
+    sorted_ids = photon_ids[sorted_rows]
+
+    direction_vectors = np.empty(positions.shape, dtype=np.float32)
+    valid = np.empty(len(positions), dtype=np.bool_)
+    _compute_directions_kernel(positions, sorted_ids, sorted_rows, previous_ids, direction_vectors, valid)
+    return direction_vectors[valid]
+
+
+try:
+    from compute_directions import compute_directions  # Import from the .pyd module
+except ImportError:
+    compute_directions = compute_directions_fallback
 
 
 def spherical_to_cartesian(azimuth, elevation):
@@ -38,10 +91,11 @@ def compute_angular_deviation(direction_vectors, reference_vector):
         reference_vector (np.ndarray): Reference vector.
 
     Returns:
-        np.ndarray: Array of angular deviations (in degrees).
+        np.ndarray: Array of angular deviations (in degrees), as float32.
     """
-    # Compute dot product
-    dot_products = np.dot(direction_vectors, reference_vector)
+    # Compute dot product in single precision
+    direction_vectors = np.asarray(direction_vectors, dtype=np.float32)
+    dot_products = np.dot(direction_vectors, np.asarray(reference_vector, dtype=np.float32))
 
     # Clip values to [-1, 1] for safety
     dot_products = np.clip(dot_products, -1.0, 1.0)
@@ -52,10 +106,13 @@ def compute_angular_deviation(direction_vectors, reference_vector):
     return angular_deviations
 
 
+@functools.lru_cache(maxsize=None)
 def compute_local_coordinate_system(azimuth, elevation):
     """
     Computes the local coordinate system (x, y, z) based on azimuth and elevation.
 
+    Results are memoized per (azimuth, elevation), so the returned axes are read-only.
+
     Args:
         azimuth (float): Azimuth angle in degrees (measured from y-axis towards x-axis).
         elevation (float): Elevation angle in degrees (measured from the horizontal plane).
@@ -75,6 +132,10 @@ def compute_local_coordinate_system(azimuth, elevation):
     local_y = np.cross(local_z, local_x)
     local_y /= np.linalg.norm(local_y)  # Ensure normalization
 
+    # The cached axes are shared between callers
+    for axis in (local_x, local_y, local_z):
+        axis.setflags(write=False)
+
     return local_x, local_y, local_z
 
 
@@ -89,12 +150,61 @@ def transform_to_local(directions, local_x, local_y, local_z):
         local_z (np.ndarray): Local z-axis unit vector in the global coordinate system.
 
     Returns:
-        np.ndarray: Array of direction vectors in the local coordinate system.
+        np.ndarray: Array of float32 direction vectors in the local coordinate system.
     """
-    # Create a rotation matrix from the local axes
-    rotation_matrix = np.array([local_x, local_y, local_z]).T
+    # Create a single-precision rotation matrix from the local axes
+    rotation_matrix = np.ascontiguousarray(np.array([local_x, local_y, local_z], dtype=np.float32).T)
 
     # Transform directions into the local coordinate system
-    local_directions = directions @ rotation_matrix
+    local_directions = np.asarray(directions, dtype=np.float32) @ rotation_matrix
 
-    return local_directions
\ No newline at end of file
+    return local_directions
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _transform_and_deviate(directions, rotation_matrix, global_reference, local_directions, angular_deviations):
+    for i in prange(directions.shape[0]):
+        dot_product = 0.0
+        for j in range(3):
+            local_directions[i, j] = (
+                directions[i, 0] * rotation_matrix[0, j]
+                + directions[i, 1] * rotation_matrix[1, j]
+                + directions[i, 2] * rotation_matrix[2, j]
+            )
+            dot_product += directions[i, j] * global_reference[j]
+        dot_product = min(max(dot_product, -1.0), 1.0)
+        angular_deviations[i] = math.degrees(math.acos(dot_product))
+
+
+def transform_and_compute_deviation(directions, local_x, local_y, local_z, reference_vector):
+    """
+    Transforms direction vectors into the local coordinate system and computes their angular
+    deviation from a local reference vector in a single pass.
+
+    Equivalent to `transform_to_local` followed by `compute_angular_deviation`, without
+    materializing intermediate arrays.
+
+    Args:
+        directions (np.ndarray): Array of normalized global direction vectors (shape: [N, 3]).
+        local_x (np.ndarray): Local x-axis unit vector in the global coordinate system.
+        local_y (np.ndarray): Local y-axis unit vector in the global coordinate system.
+        local_z (np.ndarray): Local z-axis unit vector in the global coordinate system.
+        reference_vector (np.ndarray): Reference vector in the local coordinate system.
+
+    Returns:
+        tuple: (local_directions, angular_deviations)
+            - local_directions: Array of float32 direction vectors in the local coordinate system.
+            - angular_deviations: Array of angular deviations (in degrees), as float32.
+    """
+    # Directions are streamed in single precision; the per-photon dot products accumulate in double
+    directions = np.ascontiguousarray(directions, dtype=np.float32)
+    rotation_matrix = np.array([local_x, local_y, local_z], dtype=np.float64).T
+    global_reference = rotation_matrix @ np.asarray(reference_vector, dtype=np.float64)
+    rotation_matrix = rotation_matrix.astype(np.float32)
+    global_reference = global_reference.astype(np.float32)
+
+    local_directions = np.empty_like(directions)
+    angular_deviations = np.empty(len(directions), dtype=np.float32)
+    _transform_and_deviate(directions, rotation_matrix, global_reference, local_directions, angular_deviations)
+
+    return local_directions, angular_deviations
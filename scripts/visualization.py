@@ -1,44 +1,480 @@
+import functools
 import numpy as np
 import matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from matplotlib.animation import FuncAnimation
 from matplotlib.colors import BoundaryNorm, ListedColormap, LinearSegmentedColormap
-from scipy.spatial import ConvexHull
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
+from numba import njit
 
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.spatial import ConvexHull
 
-def plot_polar_distribution_of_rays_with_hull(directions, output_file="plot_polar_distribution_of_rays_with_hull.png"):
+# Number of directions converted to polar angles at a time when binning large datasets
+_CHUNK_SIZE = 1 << 20
+
+# Relative spread across the principal axis below which projected points are treated as collinear
+_DEGENERATE_SPREAD = 1e-12
+
+# Radiance figures kept for reuse by later calls that do not show them, keyed by title and bin count
+_FIGURE_CACHE = {}
+
+# Colormap of the polar radiance plots (white -> dark blue -> dark yellow -> dark red), built once
+_RADIANCE_COLORS = [
+    (1.0, 1.0, 1.0),  # White at 0
+    (0.0, 0.0, 0.5),  # Dark blue at 1/3 of the range (2.33 MW/sr)
+    (1.0, 0.9, 0.0),  # Dark yellow at 2/3 of the range (4.66 MW/sr)
+    (0.8, 0.0, 0.0),  # Dark red at the top of the range (7 MW/sr)
+]
+_RADIANCE_CMAP = LinearSegmentedColormap.from_list("CustomRadiance", _RADIANCE_COLORS, N=256)
+
+def _polar_project(directions):
     """
-    Plots the polar distribution of direction vectors and overlays the limiting area enclosing all rays.
+    Computes the azimuth (radians), zenith (degrees) and polar-plane x, y of each direction.
+
+    Directions are processed in float32, which is far more precise than the plots need and halves
+    the memory traffic of the transcendental passes. Every result is written in place into its own
+    output array, so no intermediate arrays are allocated besides the four results.
+    """
+    directions = np.ascontiguousarray(directions, dtype=np.float32)
+    azimuth, zenith, x, y = (np.empty(len(directions), dtype=np.float32) for _ in range(4))
+
+    np.arctan2(directions[:, 0], directions[:, 1], out=azimuth)
+    np.degrees(np.arccos(directions[:, 2], out=zenith), out=zenith)
+    np.multiply(np.cos(azimuth, out=x), zenith, out=x)
+    np.multiply(np.sin(azimuth, out=y), zenith, out=y)
+    return azimuth, zenith, x, y
+
+def _bin_indices(values, edges):
+    """
+    Maps values to the bins of increasing edges, as np.histogram does.
+
+    Uniformly spaced edges are resolved with arithmetic; other edges fall back to a binary search
+    with np.searchsorted. Bins are half-open except the last, which includes the right edge.
+
+    Args:
+        values (np.ndarray): Values to bin.
+        edges (np.ndarray): Increasing bin edges.
+
+    Returns:
+        np.ndarray: Bin index of each value, or -1 for values outside the edges (in the precision of the values).
+    """
+    bins = len(edges) - 1
+    indices = np.full(len(values), -1, dtype=np.intp)
+
+    # Test the outer edges in the precision of the values, so that values rounded onto an edge, such as
+    # a float32 azimuth of pi, stay inside
+    edge_type = values.dtype.type
+    inside = (values >= edge_type(edges[0])) & (values <= edge_type(edges[-1]))
+    kept = values[inside]
+
+    if not np.allclose(np.diff(edges), (edges[-1] - edges[0]) / bins, rtol=1e-9, atol=0):
+        kept_indices = np.searchsorted(edges, kept, side='right') - 1
+    else:
+        kept_indices = ((kept - edges[0]) * (bins / (edges[-1] - edges[0]))).astype(np.intp)
+        kept_indices[kept_indices == bins] -= 1
+
+        # Correct for rounding so that each value lands between its bin's edges
+        kept_indices[kept < edges[kept_indices]] -= 1
+        kept_indices[(kept >= edges[kept_indices + 1]) & (kept_indices != bins - 1)] += 1
+
+    # The right edge belongs to the last bin, and values rounded past an outer edge to the outer bins
+    np.clip(kept_indices, 0, bins - 1, out=kept_indices)
+
+    indices[inside] = kept_indices
+    return indices
+
+def _hist2d(x, y, x_edges, y_edges, weights=None):
+    """
+    Computes a 2D histogram with a single bincount; equivalent to np.histogram2d(x, y, bins=[x_edges, y_edges]).
+
+    Args:
+        x (np.ndarray): Values binned along the first axis.
+        y (np.ndarray): Values binned along the second axis.
+        x_edges (np.ndarray): Increasing bin edges of the first axis.
+        y_edges (np.ndarray): Increasing bin edges of the second axis.
+        weights (np.ndarray): Optional weight of each (x, y) pair.
+
+    Returns:
+        np.ndarray: Count (or summed weight) per bin, shape (len(x_edges) - 1, len(y_edges) - 1).
+    """
+    x_bins, y_bins = len(x_edges) - 1, len(y_edges) - 1
+    x_indices = _bin_indices(x, x_edges)
+    y_indices = _bin_indices(y, y_edges)
+    inside = (x_indices >= 0) & (y_indices >= 0)
+    flat = x_indices[inside] * y_bins + y_indices[inside]
+    counts = np.bincount(flat, weights=None if weights is None else weights[inside], minlength=x_bins * y_bins)
+    return counts.reshape(x_bins, y_bins).astype(np.float64)
+
+def _akl_toussaint_filter(x, y):
+    """
+    Discards points that cannot be convex hull vertices, using the Akl-Toussaint heuristic.
+
+    The points extreme in x, y, x + y and x - y span a polygon inside the hull; every point strictly
+    inside that polygon is interior to the hull as well.
+
+    Args:
+        x (np.ndarray): x coordinates of the points.
+        y (np.ndarray): y coordinates of the points.
+
+    Returns:
+        np.ndarray: The remaining points (shape: [M, 2]), a superset of the hull vertices.
+    """
+    points = np.column_stack((x, y))
+    if len(points) < 8:
+        return points
+
+    extremes = [np.argmin(x), np.argmax(x), np.argmin(y), np.argmax(y)]
+    extremes += [np.argmin(x + y), np.argmax(x + y), np.argmin(x - y), np.argmax(x - y)]
+    polygon = np.unique(points[extremes], axis=0)
+    if len(polygon) < 3:
+        return points
+
+    # Extreme points lie on the hull, so sorting them by angle gives a counter-clockwise polygon
+    center = polygon.mean(axis=0)
+    polygon = polygon[np.argsort(np.arctan2(polygon[:, 1] - center[1], polygon[:, 0] - center[0]))]
+
+    # Keep the points on or outside any edge of the polygon
+    inside = np.ones(len(points), dtype=bool)
+    for start, end in zip(polygon, np.roll(polygon, -1, axis=0)):
+        edge_x, edge_y = end - start
+        inside &= edge_x * (y - start[1]) - edge_y * (x - start[0]) > 0
+    return points[~inside]
+
+@njit(cache=True, nogil=True)
+def _turns_left(x, y, a, b, c):
+    """Whether the path through points a, b, c turns strictly counter-clockwise at b."""
+    return (np.float64(x[b]) - x[a]) * (np.float64(y[c]) - y[a]) - (np.float64(y[b]) - y[a]) * (np.float64(x[c]) - x[a]) > 0
+
+@njit(cache=True, nogil=True)
+def _monotone_chain(x, y, order):
+    """Returns the hull vertex indices, counter-clockwise, given the point indices sorted lexicographically."""
+    n = len(order)
+    hull = np.empty(2 * n, dtype=np.int64)
+    size = 0
+
+    # Lower hull, left to right
+    for k in range(n):
+        while size >= 2 and not _turns_left(x, y, hull[size - 2], hull[size - 1], order[k]):
+            size -= 1
+        hull[size] = order[k]
+        size += 1
+
+    # Upper hull, right to left
+    lower_size = size
+    for k in range(n - 2, -1, -1):
+        while size > lower_size and not _turns_left(x, y, hull[size - 2], hull[size - 1], order[k]):
+            size -= 1
+        hull[size] = order[k]
+        size += 1
+
+    # The last vertex repeats the first one
+    return hull[:max(size - 1, 1)]
+
+@njit(cache=True, nogil=True)
+def _principal_spread(x, y):
+    """Returns the minor and major eigenvalues of the points' scatter matrix and the major axis direction."""
+    n = len(x)
+    mean_x = 0.0
+    mean_y = 0.0
+    for i in range(n):
+        mean_x += x[i]
+        mean_y += y[i]
+    mean_x /= n
+    mean_y /= n
+
+    sxx = 0.0
+    syy = 0.0
+    sxy = 0.0
+    for i in range(n):
+        dx = x[i] - mean_x
+        dy = y[i] - mean_y
+        sxx += dx * dx
+        syy += dy * dy
+        sxy += dx * dy
+
+    # Closed-form eigen decomposition of the symmetric 2x2 matrix [[sxx, sxy], [sxy, syy]]
+    half_trace = 0.5 * (sxx + syy)
+    radius = np.hypot(0.5 * (sxx - syy), sxy)
+    major = half_trace + radius
+    if sxy != 0.0:
+        axis_x, axis_y = sxy, major - sxx
+    elif sxx >= syy:
+        axis_x, axis_y = 1.0, 0.0
+    else:
+        axis_x, axis_y = 0.0, 1.0
+    return half_trace - radius, major, axis_x, axis_y
+
+def _convex_hull(points):
+    """
+    Finds the convex hull of 2D points with Andrew's monotone chain algorithm.
+
+    Args:
+        points (np.ndarray): Points (shape: [N, 2]).
+
+    Returns:
+        np.ndarray: Hull vertices in counter-clockwise order (shape: [H, 2]). Collinear points are
+            not vertices; inputs with fewer than three points are returned as they are, and collinear
+            inputs return their two extreme points.
+    """
+    if len(points) < 3:
+        return points
+
+    # Points spanning less than two dimensions (e.g. a collimated beam) bound a segment between their extremes
+    minor, major, axis_x, axis_y = _principal_spread(points[:, 0], points[:, 1])
+    if minor <= _DEGENERATE_SPREAD * major:
+        along = points[:, 0] * axis_x + points[:, 1] * axis_y
+        return points[[np.argmin(along), np.argmax(along)]]
+
+    order = np.lexsort((points[:, 1], points[:, 0]))
+    return points[_monotone_chain(points[:, 0], points[:, 1], order)]
+
+def _polar_histogram_with_hull(directions, azimuth_edges, zenith_edges, power_per_photon, chunk_size=_CHUNK_SIZE):
+    """
+    Bins direction vectors by azimuth and zenith and finds the convex hull of their polar projection,
+    one chunk at a time so that no full-length angle arrays are materialized.
 
     Args:
         directions (np.ndarray): Array of normalized direction vectors (shape: [N, 3]).
-        output_file (str): Path to save the plot.
+        azimuth_edges (np.ndarray): Azimuth bin edges in radians.
+        zenith_edges (np.ndarray): Zenith bin edges in degrees.
+        power_per_photon (float): Power per photon in Watts.
+        chunk_size (int): Number of directions processed per chunk.
+
+    Returns:
+        tuple: (power_density, hull_points)
+            - power_density: Power per (azimuth, zenith) bin in Watts.
+            - hull_points: Hull vertices of the (x, y) polar projection, in counter-clockwise order.
+    """
+    counts = np.zeros((len(azimuth_edges) - 1, len(zenith_edges) - 1))
+    candidates = []
+
+    for start in range(0, len(directions), chunk_size):
+        # Azimuth in radians, zenith in degrees and their Cartesian projection
+        azimuth, zenith, x, y = _polar_project(directions[start:start + chunk_size])
+
+        # Accumulate the photon counts of this chunk
+        counts += _hist2d(azimuth, zenith, azimuth_edges, zenith_edges)
+
+        # Only the hull vertices of a chunk can be vertices of the overall hull
+        candidates.append(_convex_hull(_akl_toussaint_filter(x, y)))
+
+    # Every photon carries the same power, so weight the counts once per bin
+    points = np.concatenate(candidates) if candidates else np.empty((0, 2), dtype=np.float32)
+    return counts * power_per_photon, _convex_hull(points)
+
+def _close_loop(a):
+    """Returns a copy of `a` with its first element repeated at the end, closing the loop."""
+    if len(a) == 0:
+        return a.copy()
+    out = np.empty((a.shape[0] + 1,) + a.shape[1:], dtype=a.dtype)
+    out[:-1] = a
+    out[-1] = a[0]
+    return out
+
+def _hull_to_polar(hull_points):
+    """Converts (x, y) hull vertices back to a closed loop of polar (azimuth, zenith) coordinates."""
+    closed = _close_loop(hull_points)  # Close the loop
+    hull_azimuth = np.arctan2(closed[:, 1], closed[:, 0])
+    hull_zenith = np.hypot(closed[:, 0], closed[:, 1])
+    return hull_azimuth, hull_zenith
+
+@dataclass
+class PolarProjection:
+    """
+    Polar angles of a set of direction vectors and the convex hull enclosing them, computed once
+    so that several polar plots of the same directions can share them.
+
+    Attributes:
+        azimuth (np.ndarray): Azimuth of each direction in radians.
+        zenith (np.ndarray): Zenith of each direction in degrees.
+        hull_azimuth (np.ndarray): Azimuth of the hull vertices in radians, as a closed loop.
+        hull_zenith (np.ndarray): Zenith of the hull vertices in degrees, as a closed loop.
     """
-    # Convert directions to polar coordinates
-    azimuth = np.arctan2(directions[:, 0], directions[:, 1])  # Azimuth in radians
-    zenith = np.degrees(np.arccos(directions[:, 2]))  # Zenith in degrees
+    azimuth: np.ndarray
+    zenith: np.ndarray
+    hull_azimuth: np.ndarray
+    hull_zenith: np.ndarray
+
+    @classmethod
+    def from_directions(cls, directions):
+        """
+        Projects direction vectors to polar angles and computes their convex hull.
+
+        Args:
+            directions (np.ndarray): Array of normalized direction vectors (shape: [N, 3]).
+
+        Returns:
+            PolarProjection: Projection of the directions.
+        """
+        # Azimuth in radians, zenith in degrees and their Cartesian projection
+        azimuth, zenith, x, y = _polar_project(directions)
 
-    # Convert to Cartesian for Convex Hull calculation
-    x = zenith * np.cos(azimuth)
-    y = zenith * np.sin(azimuth)
+        # Keep only the points that can be convex hull vertices
+        points = _akl_toussaint_filter(x, y)
+        hull_azimuth, hull_zenith = _hull_to_polar(_convex_hull(points))
 
-    # Compute Convex Hull
-    points = np.vstack((x, y)).T
-    hull = ConvexHull(points)
+        return cls(azimuth, zenith, hull_azimuth, hull_zenith)
+
+@functools.lru_cache(maxsize=8)
+def _solid_angle_bins(bins):
+    """
+    Computes the azimuth and zenith bin edges of the polar radiance plots and the solid angle of each bin.
+
+    The results are cached per bin count and returned read-only, so they must not be modified.
+
+    Args:
+        bins (int): Number of bins for azimuth and zenith angles.
+
+    Returns:
+        tuple: (azimuth_edges, zenith_edges, bin_area)
+            - azimuth_edges: Azimuth bin edges in radians.
+            - zenith_edges: Zenith bin edges in degrees.
+            - bin_area: Solid angle of each (azimuth, zenith) bin in steradians, infinite where not positive.
+    """
+    # Define bin edges for azimuth and zenith
+    azimuth_edges = np.linspace(-np.pi, np.pi, bins + 1)  # Azimuth bins in radians
+    zenith_edges = np.linspace(0, 90, bins + 1)           # Zenith bins in degrees
+
+    # Compute bin area using solid angle formula
+    zenith_centers = (zenith_edges[:-1] + zenith_edges[1:]) / 2  # Midpoints in degrees
+    sin_zenith = np.sin(np.radians(zenith_centers))  # sin(zenith) for bin centers
+    bin_area = np.outer(np.diff(azimuth_edges), sin_zenith * np.diff(np.radians(zenith_edges)))  # Solid angle
+
+    bin_area[bin_area <= 0] = np.inf  # Prevent division by zero or negative areas
+
+    for array in (azimuth_edges, zenith_edges, bin_area):
+        array.setflags(write=False)
+    return azimuth_edges, zenith_edges, bin_area
+
+def _polar_power_density(directions, azimuth_edges, zenith_edges, power_per_photon):
+    """
+    Bins photon power by azimuth and zenith and returns it with the enclosing hull.
+
+    Args:
+        directions (np.ndarray or PolarProjection): Normalized direction vectors (shape: [N, 3]),
+            or their precomputed polar projection.
+        azimuth_edges (np.ndarray): Azimuth bin edges in radians.
+        zenith_edges (np.ndarray): Zenith bin edges in degrees.
+        power_per_photon (float): Power per photon in Watts.
+
+    Returns:
+        tuple: (power_density, hull_azimuth, hull_zenith)
+            - power_density: Power per (azimuth, zenith) bin in Watts.
+            - hull_azimuth, hull_zenith: Hull vertices in polar coordinates, as a closed loop.
+    """
+    if isinstance(directions, PolarProjection):
+        counts = _hist2d(directions.azimuth, directions.zenith, azimuth_edges, zenith_edges)
+        return counts * power_per_photon, directions.hull_azimuth, directions.hull_zenith
+
+    # Raw directions are projected chunk by chunk
+    power_density, hull_points = _polar_histogram_with_hull(directions, azimuth_edges, zenith_edges, power_per_photon)
+    return (power_density, *_hull_to_polar(hull_points))
+
+def _polar_radiance(directions, bins, power_per_photon):
+    """
+    Computes the radiance of each (azimuth, zenith) bin and the hull enclosing the directions.
+
+    Args:
+        directions (np.ndarray or PolarProjection): Normalized direction vectors (shape: [N, 3]),
+            or their precomputed polar projection.
+        bins (int): Number of bins for azimuth and zenith angles.
+        power_per_photon (float): Power per photon in Watts.
+
+    Returns:
+        tuple: (radiance_per_sr, hull_azimuth, hull_zenith)
+            - radiance_per_sr: Power per solid angle of each (azimuth, zenith) bin in W/sr.
+            - hull_azimuth, hull_zenith: Hull vertices in polar coordinates, as a closed loop.
+    """
+    azimuth_edges, zenith_edges, bin_area = _solid_angle_bins(bins)
+    power_density, hull_azimuth, hull_zenith = _polar_power_density(directions, azimuth_edges, zenith_edges, power_per_photon)
+    return power_density / bin_area, hull_azimuth, hull_zenith
+
+def _radiance_figure(title, colorbar_label, bins, vmax, caption, show):
+    """
+    Returns the artists of a polar radiance plot, reusing the figure of an earlier call when possible.
+
+    Figures that are not shown are created outside pyplot and cached, so later calls with the same
+    title and bin count only update their data instead of rebuilding the axes, ticks and colorbar.
+
+    Args:
+        title (str): Title of the plot.
+        colorbar_label (str): Label of the colorbar.
+        bins (int): Number of bins for azimuth and zenith angles.
+        vmax (float): Upper limit of the colour scale.
+        caption (bool): Whether to reserve a caption line above the title.
+        show (bool): Whether the plot will be shown; shown figures are created by pyplot and not cached.
+
+    Returns:
+        tuple: (fig, heatmap, hull_line, caption_text), where caption_text is None without a caption.
+    """
+    key = (title, bins)
+    if not show and key in _FIGURE_CACHE:
+        return _FIGURE_CACHE[key]
+
+    if show:
+        fig, ax = plt.subplots(subplot_kw={'projection': 'polar'}, figsize=(10, 8))
+    else:
+        fig = Figure(figsize=(10, 8))
+        ax = fig.add_subplot(projection='polar')
+
+    # Plot an empty histogram as a heatmap, with each bin drawn between its edges
+    azimuth_edges, zenith_edges, _ = _solid_angle_bins(bins)
+    heatmap = ax.pcolormesh(
+        azimuth_edges, zenith_edges, np.zeros((bins, bins)), cmap=_RADIANCE_CMAP, shading='flat', vmin=0, vmax=vmax, rasterized=True
+    )
+    cbar = fig.colorbar(heatmap, ax=ax, pad=0.1)
+    cbar.set_label(colorbar_label)
+
+    # Plot an empty Convex Hull
+    hull_line, = ax.plot([], [], color='red', lw=2, label="Enclosing Boundary")
+
+    # Customize plot appearance
+    ax.set_title(title, fontsize=16)
+    ax.set_theta_zero_location('N')
+    ax.set_theta_direction(-1)
+    ax.set_ylim(0, 90)  # Zenith angle range (degrees)
+    ax.set_rticks([10, 20, 30, 40, 50, 60, 70, 80, 90])  # Set radial ticks
+    ax.set_rlabel_position(0)  # Move radial labels to avoid overlap with grid lines
+    ax.legend(loc="upper right")
+
+    # Lay out the figure once, leaving headroom for the caption above the title
+    if caption:
+        caption_text = ax.text(0.5, 1.1, "", transform=ax.transAxes, fontsize=12, ha="center")
+        fig.tight_layout(rect=(0, 0, 1, 0.94))
+    else:
+        caption_text = None
+        fig.tight_layout()
+
+    figure = (fig, heatmap, hull_line, caption_text)
+    if not show:
+        _FIGURE_CACHE[key] = figure
+    return figure
+
+def plot_polar_distribution_of_rays_with_hull(directions, output_file="plot_polar_distribution_of_rays_with_hull.png", show=False):
+    """
+    Plots the polar distribution of direction vectors and overlays the limiting area enclosing all rays.
+
+    Args:
+        directions (np.ndarray or PolarProjection): Array of normalized direction vectors (shape: [N, 3]),
+            or their precomputed polar projection.
+        output_file (str): Path to save the plot.
+        show (bool): Whether to show the plot; otherwise the figure is closed once saved.
+    """
+    # Convert directions to polar coordinates and compute the Convex Hull, unless already done
+    if isinstance(directions, PolarProjection):
+        projection = directions
+    else:
+        projection = PolarProjection.from_directions(directions)
 
     # Plot polar distribution
     fig, ax = plt.subplots(subplot_kw={'projection': 'polar'}, figsize=(10, 8))
-    ax.scatter(azimuth, zenith, c='blue', alpha=0.7, s=1, label="Photon Directions")
+    ax.scatter(projection.azimuth, projection.zenith, c='blue', alpha=0.7, s=1, label="Photon Directions")
 
     # Plot Convex Hull
-    hull_points = points[hull.vertices]
-    hull_azimuth = np.arctan2(hull_points[:, 1], hull_points[:, 0])
-    hull_zenith = np.sqrt(hull_points[:, 0]**2 + hull_points[:, 1]**2)
-    hull_azimuth = np.append(hull_azimuth, hull_azimuth[0])  # Close the loop
-    hull_zenith = np.append(hull_zenith, hull_zenith[0])
-
-    ax.plot(hull_azimuth, hull_zenith, color='red', lw=2, label="Enclosing Boundary")
+    ax.plot(projection.hull_azimuth, projection.hull_zenith, color='red', lw=2, label="Enclosing Boundary")
 
     # Set plot aesthetics
     ax.set_ylim(0, 90)
@@ -46,45 +482,37 @@ def plot_polar_distribution_of_rays_with_hull(directions, output_file="plot_pola
     ax.set_theta_zero_location('N')
     ax.set_theta_direction(-1)
     ax.legend(loc="upper right")
-    plt.savefig(output_file)
+    fig.tight_layout()
+    plt.savefig(output_file, bbox_inches=fig.bbox_inches)
     print(f"Plot saved to {output_file}")
-    plt.show(block=False)
+    if show:
+        plt.show(block=False)
+    else:
+        plt.close(fig)
 
-def plot_polar_power_distribution_with_hull(directions, power_per_photon, bins=30, output_file="polar_power_distribution_with_hull.png"):
+def plot_polar_power_distribution_with_hull(directions, power_per_photon, bins=30, output_file="polar_power_distribution_with_hull.png", show=False):
     """
     Plots the power density distribution in polar coordinates, normalizing by solid angle,
     and overlays the convex hull enclosing all rays.
 
     Args:
-        directions (np.ndarray): Array of normalized direction vectors (shape: [N, 3]).
+        directions (np.ndarray or PolarProjection): Array of normalized direction vectors (shape: [N, 3]),
+            or their precomputed polar projection.
         power_per_photon (float): Power per photon in Watts.
         bins (int): Number of bins for azimuth and zenith angles.
         output_file (str): Path to save the plot.
+        show (bool): Whether to show the plot; otherwise the figure is kept and reused by later calls.
     """
-    # Convert Cartesian directions to spherical coordinates
-    azimuth = np.arctan2(directions[:, 0], directions[:, 1])  # Azimuth in radians
-    zenith = np.degrees(np.arccos(directions[:, 2]))          # Zenith in degrees
-
-    # Define bin edges for azimuth and zenith
-    azimuth_edges = np.linspace(-np.pi, np.pi, bins + 1)  # Azimuth bins in radians
-    zenith_edges = np.linspace(0, 90, bins + 1)           # Zenith bins in degrees
+    # Bin edges and solid angle of each bin, shared across calls with the same bin count
+    azimuth_edges, zenith_edges, bin_area = _solid_angle_bins(bins)
 
-    # Bin data into a 2D histogram
-    power_density, _, _ = np.histogram2d(
-        azimuth, zenith, bins=[azimuth_edges, zenith_edges], weights=np.full_like(azimuth, power_per_photon)
-    )
-
-    # Compute bin area using solid angle formula
-    zenith_centers = (zenith_edges[:-1] + zenith_edges[1:]) / 2  # Midpoints in degrees
-    sin_zenith = np.sin(np.radians(zenith_centers))  # sin(zenith) for bin centers
-    bin_area = np.outer(sin_zenith, np.diff(azimuth_edges)) * np.diff(np.radians(zenith_edges))  # Solid angle
-
-    bin_area[bin_area <= 0] = np.inf  # Prevent division by zero or negative areas
+    # Bin data into a 2D histogram and find the convex hull
+    power_density, hull_azimuth, hull_zenith = _polar_power_density(directions, azimuth_edges, zenith_edges, power_per_photon)
 
     # Normalize power density by solid angle (bin area)
     power_density_per_sr = np.divide(
-        power_density, bin_area.T,
-        out=np.zeros_like(power_density), where=bin_area.T > 0
+        power_density, bin_area,
+        out=np.zeros_like(power_density), where=bin_area > 0
     )
 
     # Convert to MW/sr for display but keep calculations in W/sr
@@ -98,93 +526,43 @@ def plot_polar_power_distribution_with_hull(directions, power_per_photon, bins=3
     vmin = 0
     vmax = 7e6  # 7 MW/sr converted to W/sr
 
-    # Create a custom colormap
-    colors = [
-        (1.0, 1.0, 1.0),  # White at 0
-        (0.0, 0.0, 0.5),  # Dark blue at 2.33 MW/sr
-        (1.0, 0.9, 0.0),  # Dark yellow at 4.66 MW/sr
-        (0.8, 0.0, 0.0),  # Dark red at 7 MW/sr
-    ]
-    radiance_cmap = LinearSegmentedColormap.from_list("CustomRadiance", colors, N=256)
-
-    # Convert edges to centers
-    azimuth_centers = (azimuth_edges[:-1] + azimuth_edges[1:]) / 2
-    zenith_centers = (zenith_edges[:-1] + zenith_edges[1:]) / 2
-
-    # Create a meshgrid for plotting
-    theta, r = np.meshgrid(azimuth_centers, zenith_centers)
-
-    # Calculate Convex Hull
-    x = zenith * np.cos(azimuth)
-    y = zenith * np.sin(azimuth)
-    points = np.vstack((x, y)).T
-    hull = ConvexHull(points)
-    hull_points = points[hull.vertices]
-    hull_azimuth = np.arctan2(hull_points[:, 1], hull_points[:, 0])
-    hull_zenith = np.sqrt(hull_points[:, 0]**2 + hull_points[:, 1]**2)
-    hull_azimuth = np.append(hull_azimuth, hull_azimuth[0])  # Close the loop
-    hull_zenith = np.append(hull_zenith, hull_zenith[0])
-
-    # Plot the histogram as a heatmap
-    fig, ax = plt.subplots(subplot_kw={'projection': 'polar'}, figsize=(10, 8))
-    heatmap = ax.pcolormesh(
-        theta, r, power_density_per_sr.T, cmap=radiance_cmap, shading='auto', vmin=vmin, vmax=vmax
+    # Plot the histogram as a heatmap and overlay the Convex Hull
+    fig, heatmap, hull_line, _ = _radiance_figure(
+        "Power Density Distribution with Convex Hull (MW/sr)", "Power Density (W/sr)", bins, vmax, caption=False, show=show
     )
-    cbar = plt.colorbar(heatmap, ax=ax, pad=0.1)
-    cbar.set_label("Power Density (W/sr)")
-
-    # Plot Convex Hull
-    ax.plot(hull_azimuth, hull_zenith, color='red', lw=2, label="Enclosing Boundary")
-
-    # Customize plot appearance
-    ax.set_title("Power Density Distribution with Convex Hull (MW/sr)", fontsize=16)
-    ax.set_theta_zero_location('N')
-    ax.set_theta_direction(-1)
-    ax.set_ylim(0, 90)  # Zenith angle range (degrees)
-    ax.set_rticks([10, 20, 30, 40, 50, 60, 70, 80, 90])  # Set radial ticks
-    ax.set_rlabel_position(0)  # Move radial labels to avoid overlap with grid lines
-    ax.legend(loc="upper right")
+    heatmap.set_array(power_density_per_sr.T)
+    heatmap.set_clim(vmin, vmax)
+    hull_line.set_data(hull_azimuth, hull_zenith)
 
     # Save and show the plot
-    plt.savefig(output_file, dpi=300)
+    fig.savefig(output_file, dpi=150, bbox_inches=fig.bbox_inches)
     print(f"Plot saved to {output_file}")
-    plt.show(block=False)
+    if show:
+        plt.show(block=False)
 
-def plot_polar_normalized_power_distribution(directions, power_per_photon, bins=30, output_file="polar_normalized_power_distribution.png"):
+def plot_polar_normalized_power_distribution(directions, power_per_photon, bins=30, output_file="polar_normalized_power_distribution.png", show=False):
     """
     Plots the non-dimensional power density distribution in polar coordinates, normalized by the maximum radiance,
     and overlays the convex hull enclosing all rays.
 
     Args:
-        directions (np.ndarray): Array of normalized direction vectors (shape: [N, 3]).
+        directions (np.ndarray or PolarProjection): Array of normalized direction vectors (shape: [N, 3]),
+            or their precomputed polar projection.
         power_per_photon (float): Power per photon in Watts.
         bins (int): Number of bins for azimuth and zenith angles.
         output_file (str): Path to save the plot.
+        show (bool): Whether to show the plot; otherwise the figure is kept and reused by later calls.
     """
-    # Convert Cartesian directions to spherical coordinates
-    azimuth = np.arctan2(directions[:, 0], directions[:, 1])  # Azimuth in radians
-    zenith = np.degrees(np.arccos(directions[:, 2]))          # Zenith in degrees
+    # Bin edges and solid angle of each bin, shared across calls with the same bin count
+    azimuth_edges, zenith_edges, bin_area = _solid_angle_bins(bins)
 
-    # Define bin edges for azimuth and zenith
-    azimuth_edges = np.linspace(-np.pi, np.pi, bins + 1)  # Azimuth bins in radians
-    zenith_edges = np.linspace(0, 90, bins + 1)           # Zenith bins in degrees
-
-    # Bin data into a 2D histogram
-    power_density, _, _ = np.histogram2d(
-        azimuth, zenith, bins=[azimuth_edges, zenith_edges], weights=np.full_like(azimuth, power_per_photon)
-    )
-
-    # Compute bin area using solid angle formula
-    zenith_centers = (zenith_edges[:-1] + zenith_edges[1:]) / 2  # Midpoints in degrees
-    sin_zenith = np.sin(np.radians(zenith_centers))  # sin(zenith) for bin centers
-    bin_area = np.outer(sin_zenith, np.diff(azimuth_edges)) * np.diff(np.radians(zenith_edges))  # Solid angle
-
-    bin_area[bin_area <= 0] = np.inf  # Prevent division by zero or negative areas
+    # Bin data into a 2D histogram and find the convex hull
+    power_density, hull_azimuth, hull_zenith = _polar_power_density(directions, azimuth_edges, zenith_edges, power_per_photon)
 
     # Normalize power density by solid angle (bin area)
     radiance_per_sr = np.divide(
-        power_density, bin_area.T,
-        out=np.zeros_like(power_density), where=bin_area.T > 0
+        power_density, bin_area,
+        out=np.zeros_like(power_density), where=bin_area > 0
     )
 
     # Compute maximum radiance and ensure it's not zero to avoid division errors
@@ -195,46 +573,66 @@ def plot_polar_normalized_power_distribution(directions, power_per_photon, bins=
     else:
         normalized_radiance = radiance_per_sr / max_radiance
 
-    # Create a custom colormap (white -> dark blue -> dark yellow -> dark red)
-    colors = [
-        (1.0, 1.0, 1.0),  # White at 0
-        (0.0, 0.0, 0.5),  # Dark blue at 0.33
-        (1.0, 0.9, 0.0),  # Dark yellow at 0.66
-        (0.8, 0.0, 0.0),  # Dark red at 1.0
-    ]
-    custom_cmap = LinearSegmentedColormap.from_list("CustomRadiance", colors, N=256)
+    # Plot the histogram as a heatmap and overlay the Convex Hull
+    fig, heatmap, hull_line, caption_text = _radiance_figure(
+        "Non-Dimensional Power Density Distribution", "Non-Dimensional Radiance", bins, 1.0, caption=True, show=show
+    )
+    heatmap.set_array(normalized_radiance.T)
+    hull_line.set_data(hull_azimuth, hull_zenith)
 
-    # Convert edges to centers
-    azimuth_centers = (azimuth_edges[:-1] + azimuth_edges[1:]) / 2
-    zenith_centers = (zenith_edges[:-1] + zenith_edges[1:]) / 2
+    # Add the maximum radiance to the plot
+    caption_text.set_text(f"Max Radiance: {max_radiance / 1e6:.2f} MW/sr")
+
+    # Save and show the plot
+    fig.savefig(output_file, dpi=150, bbox_inches=fig.bbox_inches)
+    print(f"Plot saved to {output_file}")
+    if show:
+        plt.show(block=False)
+
+def plot_polar_animation(directions_frames, power_per_photon, bins=30, output_file="polar_power_animation.gif", fps=5, max_workers=None, show=False):
+    """
+    Animates the power density distribution in polar coordinates over a sequence of frames,
+    overlaying the convex hull enclosing the rays of each frame.
+
+    The histograms and hulls of all frames are computed in a thread pool, where the hull kernels run
+    without the GIL, and the frames are then drawn one after another on a single figure.
+
+    Args:
+        directions_frames (list): Normalized direction vectors of each frame (shape: [N, 3]),
+            or their precomputed polar projections.
+        power_per_photon (float): Power per photon in Watts.
+        bins (int): Number of bins for azimuth and zenith angles.
+        output_file (str): Path to save the animation; GIF files are written with Pillow.
+        fps (int): Frames per second of the animation.
+        max_workers (int): Number of threads computing the frames, or None for the executor's default.
+        show (bool): Whether to show the plot; otherwise the figure is closed once saved.
+
+    Returns:
+        FuncAnimation: The animation, which must be kept referenced while it is shown.
+    """
+    azimuth_edges, zenith_edges, _ = _solid_angle_bins(bins)
+
+    # Bin every frame and find its hull in parallel
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        frames = list(executor.map(lambda directions: _polar_radiance(directions, bins, power_per_photon), directions_frames))
+    if not frames:
+        raise ValueError("No frames to animate: directions_frames is empty")
 
-    # Create a meshgrid for plotting
-    theta, r = np.meshgrid(azimuth_centers, zenith_centers)
-
-    # Calculate Convex Hull
-    x = zenith * np.cos(azimuth)
-    y = zenith * np.sin(azimuth)
-    points = np.vstack((x, y)).T
-    hull = ConvexHull(points)
-    hull_points = points[hull.vertices]
-    hull_azimuth = np.arctan2(hull_points[:, 1], hull_points[:, 0])
-    hull_zenith = np.sqrt(hull_points[:, 0]**2 + hull_points[:, 1]**2)
-    hull_azimuth = np.append(hull_azimuth, hull_azimuth[0])  # Close the loop
-    hull_zenith = np.append(hull_zenith, hull_zenith[0])
-
-    # Plot the histogram as a heatmap
+    # Share one colour scale across all frames so that they can be compared
+    vmax = max(np.max(radiance) for radiance, _, _ in frames) or 1.0
+
+    # Plot the first frame, then only update the data of its artists for the others
+    radiance, hull_azimuth, hull_zenith = frames[0]
     fig, ax = plt.subplots(subplot_kw={'projection': 'polar'}, figsize=(10, 8))
     heatmap = ax.pcolormesh(
-        theta, r, normalized_radiance.T, cmap=custom_cmap, shading='auto', vmin=0, vmax=1.0
+        azimuth_edges, zenith_edges, radiance.T, cmap=_RADIANCE_CMAP, shading='flat', vmin=0, vmax=vmax, rasterized=True
     )
     cbar = plt.colorbar(heatmap, ax=ax, pad=0.1)
-    cbar.set_label("Non-Dimensional Radiance")
-
-    # Plot Convex Hull
-    ax.plot(hull_azimuth, hull_zenith, color='red', lw=2, label="Enclosing Boundary")
+    cbar.set_label("Power Density (W/sr)")
+    hull_line, = ax.plot(hull_azimuth, hull_zenith, color='red', lw=2, label="Enclosing Boundary")
 
     # Customize plot appearance
-    ax.set_title("Non-Dimensional Power Density Distribution", fontsize=16)
+    title = ax.set_title("", fontsize=16)
     ax.set_theta_zero_location('N')
     ax.set_theta_direction(-1)
     ax.set_ylim(0, 90)  # Zenith angle range (degrees)
@@ -242,15 +640,26 @@ def plot_polar_normalized_power_distribution(directions, power_per_photon, bins=
     ax.set_rlabel_position(0)  # Move radial labels to avoid overlap with grid lines
     ax.legend(loc="upper right")
 
-    # Add the maximum radiance to the plot
-    ax.text(0.5, 1.1, f"Max Radiance: {max_radiance / 1e6:.2f} MW/sr", transform=ax.transAxes, fontsize=12, ha="center")
+    def draw_frame(index):
+        radiance, hull_azimuth, hull_zenith = frames[index]
+        heatmap.set_array(radiance.T)
+        hull_line.set_data(hull_azimuth, hull_zenith)
+        title.set_text(f"Power Density Distribution, Frame {index + 1}/{len(frames)}")
+        return heatmap, hull_line, title
 
-    # Save and show the plot
-    plt.savefig(output_file, dpi=300)
-    print(f"Plot saved to {output_file}")
-    plt.show(block=False)
+    # Lay out the figure once, then save and show the animation
+    draw_frame(0)
+    fig.tight_layout()
+    animation = FuncAnimation(fig, draw_frame, frames=len(frames), interval=1000 / fps)
+    animation.save(output_file, writer="pillow" if output_file.lower().endswith(".gif") else None, fps=fps, dpi=150)
+    print(f"Animation saved to {output_file}")
+    if show:
+        plt.show(block=False)
+    else:
+        plt.close(fig)
+    return animation
 
-def plot_angular_distribution(angular_deviations, power_per_photon, bins=10, output_file="angular_distribution_power.png"):
+def plot_angular_distribution(angular_deviations, power_per_photon, bins=10, output_file="angular_distribution_power.png", show=False):
     """
     Plots the angular distribution of photon angular deviations weighted by power.
 
@@ -259,6 +668,7 @@ def plot_angular_distribution(angular_deviations, power_per_photon, bins=10, out
         power_per_photon (float): Power associated with each photon in Watts.
         bins (int): Number of bins for the histogram.
         output_file (str): Path to save the plot.
+        show (bool): Whether to show the plot; otherwise the figure is closed once saved.
     """
     # Calculate the histogram data
     counts, bin_edges = np.histogram(angular_deviations, bins=bins)
@@ -306,30 +716,41 @@ def plot_angular_distribution(angular_deviations, power_per_photon, bins=10, out
     fig.tight_layout()
 
     # Save and display the plot
-    plt.savefig(output_file)
+    plt.savefig(output_file, bbox_inches=fig.bbox_inches)
     print(f"Plot saved to {output_file}")
-    plt.show(block=False)
+    if show:
+        plt.show(block=False)
+    else:
+        plt.close(fig)
 
-def plot_power_azimuth(directions, power_per_photon, bins=30, output_file="power_azimuth.png"):
+def plot_power_azimuth(directions, power_per_photon, bins=30, output_file="power_azimuth.png", show=False):
     """
     Plots both power and cumulative power distribution as a function of azimuth angle.
 
     Args:
-        directions (np.ndarray): Array of normalized direction vectors (shape: [N, 3]).
+        directions (np.ndarray or PolarProjection): Array of normalized direction vectors (shape: [N, 3]),
+            or their precomputed polar projection.
         power_per_photon (float): Power associated with each photon in Watts.
         bins (int): Number of bins for azimuth angles.
         output_file (str): Path to save the plot.
+        show (bool): Whether to show the plot; otherwise the figure is closed once saved.
     """
-    # Convert Cartesian directions to azimuth in radians
-    azimuth = np.arctan2(directions[:, 0], directions[:, 1])  # Azimuth in radians
+    # Convert Cartesian directions to azimuth in radians, unless already done
+    if isinstance(directions, PolarProjection):
+        azimuth = directions.azimuth
+    else:
+        # Work in float32: plotting needs far less precision and this halves the memory traffic
+        directions = np.ascontiguousarray(directions, dtype=np.float32)
+        azimuth = np.arctan2(directions[:, 0], directions[:, 1])  # Azimuth in radians
     azimuth = np.degrees(azimuth)  # Convert to degrees
     azimuth = (azimuth + 360) % 360  # Map range to [0, 360)
 
     # Define azimuth bin edges
     azimuth_edges = np.linspace(0, 360, bins + 1)  # Azimuth bins in degrees
 
-    # Compute energy per azimuth bin
-    energy_per_bin, _ = np.histogram(azimuth, bins=azimuth_edges, weights=np.full_like(azimuth, power_per_photon))
+    # Compute energy per azimuth bin from the photon counts
+    counts, _ = np.histogram(azimuth, bins=azimuth_edges)
+    energy_per_bin = counts * power_per_photon
 
     # Ensure cumulative energy starts at 0.0
     cumulative_energy = np.insert(np.cumsum(energy_per_bin), 0, 0.0)
@@ -361,28 +782,39 @@ def plot_power_azimuth(directions, power_per_photon, bins=30, output_file="power
     ax1.grid()
 
     # Save and display the plot
-    plt.savefig(output_file)
+    plt.savefig(output_file, bbox_inches=fig.bbox_inches)
     print(f"Plot saved to {output_file}")
-    plt.show(block=False)
+    if show:
+        plt.show(block=False)
+    else:
+        plt.close(fig)
 
-def plot_power_zenith(directions, power_per_photon, bins=30, output_file="power_zenith.png"):
+def plot_power_zenith(directions, power_per_photon, bins=30, output_file="power_zenith.png", show=False):
     """
     Plots both power and cumulative power distribution as a function of zenith angle.
 
     Args:
-        directions (np.ndarray): Array of normalized direction vectors (shape: [N, 3]).
+        directions (np.ndarray or PolarProjection): Array of normalized direction vectors (shape: [N, 3]),
+            or their precomputed polar projection.
         power_per_photon (float): Power associated with each photon in Watts.
         bins (int): Number of bins for zenith angles.
         output_file (str): Path to save the plot.
+        show (bool): Whether to show the plot; otherwise the figure is closed once saved.
     """
-    # Convert Cartesian directions to zenith in degrees
-    zenith = np.degrees(np.arccos(directions[:, 2]))  # Zenith in degrees
+    # Convert Cartesian directions to zenith in degrees, unless already done
+    if isinstance(directions, PolarProjection):
+        zenith = directions.zenith
+    else:
+        # Work in float32: plotting needs far less precision and this halves the memory traffic
+        directions = np.ascontiguousarray(directions, dtype=np.float32)
+        zenith = np.degrees(np.arccos(directions[:, 2]))  # Zenith in degrees
 
     # Define zenith bin edges
     zenith_edges = np.linspace(0, 90, bins + 1)  # Zenith bins from 0 to 90 degrees
 
-    # Compute power per zenith bin
-    power_per_bin, _ = np.histogram(zenith, bins=zenith_edges, weights=np.full_like(zenith, power_per_photon))
+    # Compute power per zenith bin from the photon counts
+    counts, _ = np.histogram(zenith, bins=zenith_edges)
+    power_per_bin = counts * power_per_photon
 
     # Ensure cumulative power starts at 0.0
     cumulative_power = np.insert(np.cumsum(power_per_bin), 0, 0.0)
@@ -414,38 +846,51 @@ def plot_power_zenith(directions, power_per_photon, bins=30, output_file="power_
     ax1.grid()
 
     # Save and display the plot
-    plt.savefig(output_file)
+    plt.savefig(output_file, bbox_inches=fig.bbox_inches)
     print(f"Plot saved to {output_file}")
-    plt.show(block=False)
+    if show:
+        plt.show(block=False)
+    else:
+        plt.close(fig)
 
-def plot_power_zenith_asymmetric(directions, power_per_photon, bins=30, output_file="power_zenith_asymmetric.png"):
+def plot_power_zenith_asymmetric(directions, power_per_photon, bins=30, output_file="power_zenith_asymmetric.png", show=False):
     """
     Plots power and cumulative power distribution as a function of zenith angle,
     distinguishing contributions from the left (90°–270° azimuth) and right (270°–90° azimuth) hemispheres.
 
     Args:
-        directions (np.ndarray): Array of normalized direction vectors (shape: [N, 3]).
+        directions (np.ndarray or PolarProjection): Array of normalized direction vectors (shape: [N, 3]),
+            or their precomputed polar projection.
         power_per_photon (float): Power associated with each photon in Watts.
         bins (int): Number of bins for zenith angles.
         output_file (str): Path to save the plot.
+        show (bool): Whether to show the plot; otherwise the figure is closed once saved.
     """
-    # Convert Cartesian directions to azimuth and zenith
-    azimuth = np.arctan2(directions[:, 0], directions[:, 1])  # Azimuth in radians
+    # Convert Cartesian directions to azimuth and zenith, unless already done
+    if isinstance(directions, PolarProjection):
+        azimuth, zenith = directions.azimuth, directions.zenith
+    else:
+        # Work in float32: plotting needs far less precision and this halves the memory traffic
+        directions = np.ascontiguousarray(directions, dtype=np.float32)
+        azimuth = np.arctan2(directions[:, 0], directions[:, 1])  # Azimuth in radians
+        zenith = np.degrees(np.arccos(directions[:, 2]))  # Zenith in degrees
     azimuth = np.degrees(azimuth)  # Convert to degrees
     azimuth = (azimuth + 360) % 360  # Map azimuth to [0, 360)
 
-    zenith = np.degrees(np.arccos(directions[:, 2]))  # Zenith in degrees
-
-    # Define hemispheres based on azimuth
-    upward_hemisphere = (azimuth >= 270) | (azimuth <= 90)  # Azimuths from 270° to 90°
-    downward_hemisphere = (azimuth > 90) & (azimuth < 270)  # Azimuths from 90° to 270°
+    # Define hemispheres based on azimuth: 0 from 270° to 90° (upward), 1 from 90° to 270° (downward)
+    hemisphere = ((azimuth > 90) & (azimuth < 270)).astype(np.intp)
 
     # Define zenith bin edges
     zenith_edges = np.linspace(0, 90, bins + 1)
 
-    # Compute power per zenith bin for each hemisphere
-    power_upward, _ = np.histogram(zenith[upward_hemisphere], bins=zenith_edges, weights=np.full_like(zenith[upward_hemisphere], power_per_photon))
-    power_downward, _ = np.histogram(zenith[downward_hemisphere], bins=zenith_edges, weights=np.full_like(zenith[downward_hemisphere], power_per_photon))
+    # Count photons per (hemisphere, zenith bin) in one pass, dropping zenith angles outside the edges
+    zenith_bin = _bin_indices(zenith, zenith_edges)
+    inside = zenith_bin >= 0
+    counts = np.bincount(zenith_bin[inside] + hemisphere[inside] * bins, minlength=2 * bins).reshape(2, bins)
+
+    # Compute power per zenith bin for each hemisphere from the photon counts
+    power_upward = counts[0] * power_per_photon
+    power_downward = counts[1] * power_per_photon
 
     # Add 0.0 to cumulative power arrays
     cumulative_power_upward = np.insert(np.cumsum(power_upward), 0, 0.0)
@@ -466,10 +911,8 @@ def plot_power_zenith_asymmetric(directions, power_per_photon, bins=30, output_f
     ax1.legend(loc="upper left")
     ax1.grid()
 
-    # Adjust the y-axis ticks to remove negative signs for the downward hemisphere
-    yticks = ax1.get_yticks()
-    ax1.set_yticks(yticks)  # Explicitly set the ticks
-    ax1.set_yticklabels([f"{abs(tick):.0f}" for tick in yticks])
+    # Label the y-axis ticks without negative signs for the downward hemisphere, formatted at draw time
+    ax1.yaxis.set_major_formatter(FuncFormatter(lambda tick, _: f"{abs(tick):.0f}"))
 
     # Plot cumulative power on the same axis
     ax2 = ax1.twinx()
@@ -482,6 +925,9 @@ def plot_power_zenith_asymmetric(directions, power_per_photon, bins=30, output_f
     # Add titles and save the plot
     plt.title("Power and Cumulative Power vs. Zenith Angle (Upward vs. Downward Hemispheres)")
     fig.tight_layout()
-    plt.savefig(output_file)
+    plt.savefig(output_file, bbox_inches=fig.bbox_inches)
     print(f"Plot saved to {output_file}")
-    plt.show(block=False)
\ No newline at end of file
+    if show:
+        plt.show(block=False)
+    else:
+        plt.close(fig)
\ No newline at end of file
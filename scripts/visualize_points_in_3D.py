@@ -1,27 +1,21 @@
-import csv
 import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 
 # Function to read data from results.csv
 def read_csv(file_path):
-    points = []
-    lengths = []
-    
-    with open(file_path, 'r') as csv_file:
-        reader = csv.reader(csv_file)
-        next(reader)  # Skip the header
-        for row in reader:
-            # Extract PointA (x, y, z) and the length
-            x, y, z = map(float, row[:3])
-            length = abs(float(row[6]))  # Length is assumed to be in the 7th column (index 6)
-            points.append((x, y, z))
-            lengths.append(length)
-    
-    return np.array(points), np.array(lengths)
+    # Extract PointA (x, y, z) and the length (7th column) with pandas' vectorized parser
+    data = pd.read_csv(file_path, usecols=[0, 1, 2, 6])
+    values = data.to_numpy(dtype=float)
+    return values[:, :3], np.abs(values[:, 3])
 
 # Function to plot the 3D points
-def plot_3d_points(points, lengths):
+def plot_3d_points(points, lengths, max_points=50_000):
+    # Draw a deterministic random subsample; the 3D backend depth-sorts every point on each redraw
+    if len(points) > max_points:
+        sample = np.random.default_rng(0).choice(len(points), max_points, replace=False)
+        points, lengths = points[sample], lengths[sample]
     x, y, z = points[:, 0], points[:, 1], points[:, 2]
 
     # Create a 3D plot
@@ -29,7 +23,7 @@ def plot_3d_points(points, lengths):
     ax = fig.add_subplot(111, projection='3d')
 
     # Scatter plot with colors based on lengths
-    scatter = ax.scatter(x, y, z, c=lengths, cmap='viridis', s=10)
+    scatter = ax.scatter(x, y, z, c=lengths, cmap='viridis', s=10, rasterized=True)
     fig.colorbar(scatter, ax=ax, label='Length |PointB - PointA|')
 
     # Set labels
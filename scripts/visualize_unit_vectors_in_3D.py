@@ -1,27 +1,22 @@
-import csv
 import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 
 # Function to read data from results.csv
 def read_csv(file_path):
-    unit_vectors = []
-    lengths = []
-    
-    with open(file_path, 'r') as csv_file:
-        reader = csv.reader(csv_file)
-        next(reader)  # Skip the header
-        for row in reader:
-            # Extract unit vector components and the length
-            ux, uy, uz = map(float, row[3:6])  # Unit vector components
-            length = abs(float(row[6]))  # Length is in the 7th column (index 6)
-            unit_vectors.append((ux, uy, uz))
-            lengths.append(length)
-    
-    return np.array(unit_vectors), np.array(lengths)
+    # Extract unit vector components and the length (7th column) with pandas' vectorized parser
+    data = pd.read_csv(file_path, usecols=[3, 4, 5, 6])
+    values = data.to_numpy(dtype=float)
+    return values[:, :3], np.abs(values[:, 3])
 
 # Function to plot 3D unit vectors from the origin
-def plot_unit_vectors_from_origin(unit_vectors, lengths):
+def plot_unit_vectors_from_origin(unit_vectors, lengths, max_points=50_000):
+
+    # Draw a deterministic random subsample; the 3D backend depth-sorts every point on each redraw
+    if len(unit_vectors) > max_points:
+        sample = np.random.default_rng(0).choice(len(unit_vectors), max_points, replace=False)
+        unit_vectors, lengths = unit_vectors[sample], lengths[sample]
 
     # Extract coordinates
     x_end, y_end, z_end =     end_points = unit_vectors[:, 0], unit_vectors[:, 1], unit_vectors[:, 2]
@@ -31,7 +26,7 @@ def plot_unit_vectors_from_origin(unit_vectors, lengths):
     ax = fig.add_subplot(111, projection='3d')
 
     # Plot the unit vector endpoints
-    scatter = ax.scatter(x_end, y_end, z_end, c=lengths, cmap='viridis', s=10)
+    scatter = ax.scatter(x_end, y_end, z_end, c=lengths, cmap='viridis', s=10, rasterized=True)
     fig.colorbar(scatter, ax=ax, label='Length |PointB - PointA|')
 
     # Set labels
@@ -1,25 +1,15 @@
-import csv
 import numpy as np
+import pandas as pd
 import pyvista as pv
 
 print(pv.__version__)
 
 # Function to read data from results.csv
 def read_csv(file_path):
-    unit_vectors = []
-    lengths = []
-
-    with open(file_path, 'r') as csv_file:
-        reader = csv.reader(csv_file)
-        next(reader)  # Skip the header
-        for row in reader:
-            # Extract unit vector components and the length
-            ux, uy, uz = map(float, row[3:6])  # Unit vector components
-            length = abs(float(row[6]))  # Length is in the 7th column (index 6)
-            unit_vectors.append((ux, uy, uz))
-            lengths.append(length)
-
-    return np.array(unit_vectors), np.array(lengths)
+    # Extract unit vector components and the length (7th column) with pandas' vectorized parser
+    data = pd.read_csv(file_path, usecols=[3, 4, 5, 6])
+    values = data.to_numpy(dtype=float)
+    return values[:, :3], np.abs(values[:, 3])
 
 # Main script
 if __name__ == "__main__":